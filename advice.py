@@ -0,0 +1,131 @@
+# Advice oracles: they point the explorer to the vertex it should visit next.
+# The advice is taken from a Hamiltonian cycle of the torus, which is an optimal tour,
+# and untrusted oracles corrupt some of it.
+import functools
+from array import array
+
+
+def hamiltonian_cycle(m, n):
+    # Successor of every vertex on a Hamiltonian cycle of the m x n torus starting in vertex 0.
+    # Every row is traversed completely (wrapping around if needed) and shifts the column by
+    # -1 when going right or +1 when going left; the shifts must add up to 0 modulo n.
+    if m == 1 or n == 1:
+        size = m * n
+        return [(index + 1) % size for index in range(size)]
+    if m % 2 == 1 and (n % 2 == 0 or n > m):
+        return transpose_cycle(hamiltonian_cycle(n, m), n, m)
+
+    rights = m // 2 if m % 2 == 0 else (m - n) // 2  # number of rows going right
+    successor = [0] * (m * n)
+    col = 0
+    for row in range(m):
+        dx = 1 if row < rights else -1
+        for _ in range(n - 1):
+            next_col = (col + dx) % n
+            successor[row * n + col] = row * n + next_col
+            col = next_col
+        successor[row * n + col] = ((row + 1) % m) * n + col
+    return successor
+
+
+def transpose_cycle(successor, m, n):
+    # Turns a cycle on the m x n torus into one on the n x m torus
+    transposed = [0] * (m * n)
+    for index, next_index in enumerate(successor):
+        row, col = divmod(index, n)
+        next_row, next_col = divmod(next_index, n)
+        transposed[col * m + row] = next_col * m + next_row
+    return transposed
+
+
+@functools.lru_cache(maxsize=64)
+def successor_table(m, n):
+    # The cycle is generated once per size and process and kept as 4 bytes per vertex
+    return array('I', hamiltonian_cycle(m, n))
+
+
+class TrustedAdvice:
+    # Always points to the successor on the Hamiltonian cycle through v_0
+    name = "trusted"
+    uses_error_rate = False
+
+    def __init__(self, explorer, rng, error_rate=0.0):
+        self.explorer = explorer
+        self.rng = rng
+        self.error_rate = error_rate
+        self.successor = successor_table(explorer.m, explorer.n)
+        self.row0, self.col0 = divmod(explorer.start, explorer.n)  # the cycle is translated to start in v_0
+        self.errors = 0  # number of wrong pieces of advice given so far
+
+    def correct(self, index):
+        m, n = self.explorer.m, self.explorer.n
+        row, col = divmod(index, n)
+        local = ((row - self.row0) % m) * n + (col - self.col0) % n
+        next_row, next_col = divmod(self.successor[local], n)
+        return ((next_row + self.row0) % m) * n + (next_col + self.col0) % n
+
+    def corrupt(self):
+        # Whether the next piece of advice is wrong
+        return False
+
+    def wrong(self, index, advised):
+        candidates = [neighbor_index for neighbor_index in self.explorer.neighbors(index) if neighbor_index != advised]
+        return self.rng.choice(candidates) if candidates else advised
+
+    def advise(self):
+        index = self.explorer.position
+        advised = self.correct(index)
+        if self.corrupt():
+            self.errors += 1
+            return self.wrong(index, advised)
+        return advised
+
+
+class RandomErrorAdvice(TrustedAdvice):
+    # Every piece of advice is wrong with probability error_rate, pointing to a random other neighbor
+    name = "random"
+    uses_error_rate = True
+
+    def corrupt(self):
+        return self.error_rate > 0 and self.rng.random() < self.error_rate
+
+
+class AdversarialAdvice(RandomErrorAdvice):
+    # Wrong advice points to an unvisited neighbor off the cycle whenever possible,
+    # so an explorer that follows it is actually led astray
+    name = "adversarial"
+
+    def wrong(self, index, advised):
+        visits = self.explorer.visits
+        candidates = [neighbor_index for neighbor_index in self.explorer.neighbors(index)
+                      if neighbor_index != advised and not visits[neighbor_index]]
+        if candidates:
+            return self.rng.choice(candidates)
+        return super().wrong(index, advised)
+
+
+class BoundedErrorAdvice(RandomErrorAdvice):
+    # Like random errors, but at most max_errors pieces of advice are wrong in total
+    name = "bounded"
+
+    def __init__(self, explorer, rng, error_rate=0.0, max_errors=1):
+        super().__init__(explorer, rng, error_rate)
+        self.max_errors = max_errors
+
+    def corrupt(self):
+        return self.errors < self.max_errors and super().corrupt()
+
+
+ORACLES = {oracle.name: oracle for oracle in (TrustedAdvice, RandomErrorAdvice, AdversarialAdvice, BoundedErrorAdvice)}
+
+
+def make_oracle(spec, explorer, rng, error_rate=0.0):
+    # spec is the name of an oracle, optionally with an integer parameter, e.g. "bounded:10"
+    name, _, parameter = spec.partition(":")
+    if explorer.graph.kind != "torus":
+        raise ValueError("advice is only available on tori")
+    if name not in ORACLES:
+        raise ValueError(f"unknown advice {spec!r}, expected one of {', '.join(ORACLES)}")
+    if parameter:
+        return ORACLES[name](explorer, rng, error_rate, int(parameter))
+    return ORACLES[name](explorer, rng, error_rate)
@@ -0,0 +1,310 @@
+# Runs automated explorations without a GUI and streams one result row per run to CSV or Parquet.
+#
+#   python batch.py --m 3-20 --n 3-20 --starts origin --strategy nearest advice \
+#       --advice trusted random bounded:10 --error-rate 0 0.1 0.25 --output results.csv --workers 64
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import csv
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+
+from advice import ORACLES, make_oracle
+from cache import ResultCache, instance_key
+from explorer import TorusExplorer
+from graphs import GRID_KINDS
+import profiling
+from stats import GROUP_BY, Summary
+from strategies import STRATEGIES
+
+FIELDS = ["graph", "m", "n", "start", "strategy", "advice", "error_rate", "seed",
+          "tour_length", "revisits", "competitive_ratio", "max_frontier"]
+RESULTS = FIELDS[8:]  # the fields that are computed by an exploration
+
+
+def run_exploration(m, n, start, strategy, advice="", error_rate=0.0, seed=0, graph="torus", profiler=None):
+    explorer = TorusExplorer(m, n, kind=graph)
+    explorer.place(start)
+    explorer.begin()
+    rng = random.Random(seed)
+    oracle = make_oracle(advice, explorer, rng, error_rate) if advice else None
+    explorer_strategy = STRATEGIES[strategy](explorer, rng, oracle)
+    if profiler is not None:  # see profiling.py
+        profiler.attach_explorer(explorer, explorer_strategy, oracle)
+    step = explorer.step
+    next_direction = explorer_strategy.next_direction
+    frontier_size = explorer.frontier_size
+    max_frontier = frontier_size()
+    direction = next_direction()
+    while direction is not None:
+        step(direction)
+        frontier = frontier_size()
+        if frontier > max_frontier:
+            max_frontier = frontier
+        direction = next_direction()
+
+    tour_length = explorer.tour_length()
+    return {
+        "graph": graph,
+        "m": m,
+        "n": n,
+        "start": start,
+        "strategy": strategy,
+        "advice": advice,
+        "error_rate": error_rate,
+        "seed": seed,
+        "tour_length": tour_length,
+        "revisits": explorer.revisits(),  # steps into visited vertices, apart from returning to v_0
+        "competitive_ratio": tour_length / explorer.size if explorer.size > 1 else 1.0,  # an optimal tour is a Hamiltonian cycle of length m*n
+        "max_frontier": max_frontier,  # largest number of familiar, unvisited vertices during the exploration
+    }
+
+
+def parse_values(values, convert=int):
+    # "3-8" is a range of integers, anything else a single value
+    result = []
+    for value in values:
+        for part in value.split(","):
+            if convert is int and "-" in part[1:]:
+                low, high = part.split("-", 1)
+                result.extend(range(int(low), int(high) + 1))
+            else:
+                result.append(convert(part))
+    return result
+
+
+def start_vertices(m, n, starts, rng):
+    # "origin" is vertex 0, "all" every vertex and an integer k that many random vertices
+    if starts == "origin":
+        return [0]
+    if starts == "all":
+        return range(m * n)
+    return [rng.randrange(m * n) for _ in range(int(starts))]
+
+
+def task_seed(seed, m, n, start, strategy, advice, error_rate, graph="torus"):
+    # Seed of a single run, independent of the order and the process it runs in
+    key = f"{seed}/{m}/{n}/{start}/{strategy}/{advice}/{error_rate!r}"
+    if graph != "torus":  # runs on tori keep the seeds they had before there were other graphs
+        key += f"/{graph}"
+    key = key.encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
+
+
+def instances(args):
+    rng = random.Random(args.seed)
+    for graph in args.graph:
+        for m, n in itertools.product(args.m, args.n):
+            for start in start_vertices(m, n, args.starts, rng):
+                for strategy in args.strategy:
+                    if STRATEGIES[strategy].torus_only and graph != "torus":
+                        continue
+                    for advice in args.advice if STRATEGIES[strategy].uses_advice else [""]:
+                        uses_error_rate = advice and ORACLES[advice.partition(":")[0]].uses_error_rate
+                        for error_rate in args.error_rate if uses_error_rate else [0.0]:
+                            seed = task_seed(args.seed, m, n, start, strategy, advice, error_rate, graph)
+                            yield m, n, start, strategy, advice, error_rate, seed, graph
+
+
+def run_chunk(chunk):
+    return [run_exploration(*instance) for instance in chunk]
+
+
+def chunks(iterable, chunk_size):
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, chunk_size))
+
+
+def sweep(instances, workers=1, chunk_size=64, profiler=None, executor=None):
+    # Yields the results in the order of the instances. With several workers, the instances
+    # are sent to a process pool (executor, or a new one) in chunks; only a few chunks per worker
+    # are in flight at a time, so memory does not depend on the size of the sweep. A profiler can
+    # only be attached to runs in this process.
+    if workers <= 1:
+        for instance in instances:
+            yield run_exploration(*instance, profiler=profiler)
+        return
+    if executor is None:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from sweep(instances, workers, chunk_size, profiler, executor)
+        return
+
+    pending = collections.deque()
+    for chunk in chunks(instances, chunk_size):
+        pending.append(executor.submit(run_chunk, chunk))
+        if len(pending) >= 4 * workers:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def cached_sweep(instances, cache, workers=1, chunk_size=64, profiler=None):
+    # Like sweep, but results are taken from the cache if possible and new results are added to it.
+    # The instances are looked up a window at a time, only one instance per missing key of a window
+    # is run and its results are used for every instance with that key. The rows are yielded in
+    # order as the runs finish, and the next window is only read after the last row of this one, so
+    # memory is bounded by the window also if almost everything is cached. cache.hits counts the
+    # rows that were not run.
+    window = 16 * chunk_size * max(workers, 1)
+    with contextlib.ExitStack() as stack:
+        executor = None
+        if workers > 1:
+            executor = stack.enter_context(concurrent.futures.ProcessPoolExecutor(max_workers=workers))
+        for instances_chunk in chunks(instances, window):
+            keys = [instance_key(instance) for instance in instances_chunk]
+            results = {}  # results of every key of the window, None while missing
+            missing = {}  # the instance that is run for every missing key
+            for key, instance in zip(keys, instances_chunk):
+                if key not in results:
+                    results[key] = cache.get(key)
+                    if results[key] is None:
+                        missing[key] = instance
+                else:
+                    cache.hits += 1
+            runs = zip(missing, sweep(missing.values(), workers, chunk_size, profiler, executor))
+            for key, instance in zip(keys, instances_chunk):
+                if results[key] is None:  # the first instance with this key, the keys are run in this order
+                    _, row = next(runs)
+                    results[key] = [row[field] for field in RESULTS]
+                    cache.put(key, results[key])
+                m, n, start, strategy, advice, error_rate, seed, graph = instance
+                row = {"graph": graph, "m": m, "n": n, "start": start, "strategy": strategy, "advice": advice,
+                       "error_rate": error_rate, "seed": seed}
+                row.update(zip(RESULTS, results[key]))
+                yield row
+
+
+class CsvWriter:
+    def __init__(self, file):
+        self.writer = csv.DictWriter(file, fieldnames=FIELDS)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        pass
+
+
+class ParquetWriter:
+    # Buffers rows and writes them as row groups, so memory does not grow with the number of runs
+    def __init__(self, path, batch_size=65536):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            sys.exit("Writing Parquet files requires pyarrow (pip install pyarrow).")
+        self.pyarrow = pyarrow
+        self.writer = None
+        self.path = path
+        self.batch_size = batch_size
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        table = self.pyarrow.Table.from_pylist(self.rows)
+        if self.writer is None:
+            self.writer = self.pyarrow.parquet.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+
+
+class NullWriter:
+    def write(self, row):
+        pass
+
+    def close(self):
+        pass
+
+
+def open_writer(path):
+    if path == "none":
+        return NullWriter(), None
+    if path.endswith(".parquet"):
+        return ParquetWriter(path), None
+    file = sys.stdout if path == "-" else open(path, "w", newline="")
+    return CsvWriter(file), file
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run explorations of tori without a GUI.")
+    parser.add_argument("--graph", nargs="+", default=["torus"], choices=list(GRID_KINDS),
+                        help="graphs to explore; advice and optimal only run on tori")
+    parser.add_argument("--m", nargs="+", required=True, help="numbers of rows, e.g. 3 5 or 3-20")
+    parser.add_argument("--n", nargs="+", required=True, help="numbers of columns, e.g. 4,6 or 3-20")
+    parser.add_argument("--starts", default="origin", help="start vertices: origin, all or a number of random vertices")
+    parser.add_argument("--strategy", nargs="+", default=["advice"], choices=sorted(STRATEGIES))
+    parser.add_argument("--advice", nargs="+", default=["random"],
+                        help=f"advice oracles ({', '.join(ORACLES)}), bounded:k allows at most k errors")
+    parser.add_argument("--error-rate", nargs="+", default=["0"], help="probabilities that a piece of advice is wrong")
+    parser.add_argument("--seed", type=int, default=0, help="base seed, every run gets its own seed derived from it")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes, 0 for one per CPU")
+    parser.add_argument("--chunk-size", type=int, default=64, help="number of runs sent to a process at once")
+    parser.add_argument("--cache", help="SQLite file of earlier results, only missing runs are computed")
+    parser.add_argument("--cache-size", type=float, default=256, help="size limit of the cache in MB")
+    parser.add_argument("--output", default="-", help="CSV file, .parquet file, - for stdout or none")
+    parser.add_argument("--summary", help="JSON file with statistics of the runs per group, see stats.py")
+    parser.add_argument("--group-by", nargs="+", default=GROUP_BY, choices=FIELDS[:7], help="fields that define a group")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    args.m = parse_values(args.m)
+    args.n = parse_values(args.n)
+    args.error_rate = parse_values(args.error_rate, float)
+    for advice in args.advice:
+        if advice.partition(":")[0] not in ORACLES:
+            parser.error(f"unknown advice {advice!r}")
+
+    workers = args.workers or os.cpu_count()
+    if args.metrics and workers > 1:
+        parser.error("--metrics needs --workers 1, the runs are instrumented in this process")
+
+    profiler = profiling.Profiler() if args.metrics else None
+    summary = Summary(args.group_by) if args.summary else None
+    cache = ResultCache(args.cache, int(args.cache_size * 2**20)) if args.cache else None
+    if cache is None:
+        rows = sweep(instances(args), workers, args.chunk_size, profiler)
+    else:
+        rows = cached_sweep(instances(args), cache, workers, args.chunk_size, profiler)
+    writer, file = open_writer(args.output)
+
+    def write_rows():
+        for row in rows:
+            writer.write(row)
+            if summary is not None:
+                summary.add(row)
+
+    try:
+        profiling.run_main(args, write_rows, profiler)
+    finally:
+        writer.close()
+        if file is not None and file is not sys.stdout:
+            file.close()
+        if cache is not None:
+            cache.close()
+            print(f"cache: {cache.hits} hits, {cache.misses} runs", file=sys.stderr)
+    if summary is not None:
+        with open(args.summary, "w") as summary_file:
+            json.dump(summary.to_json(), summary_file, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+# Benchmarks of the exploration engine, of batch sweeps and of drawing on the canvas.
+# The results are written as JSON, so that runs on different commits can be compared:
+#
+#   python benchmark.py --output before.json
+#   python benchmark.py --compare before.json   # exits with 1 if a result got worse by more than --tolerance
+#
+# Drawing needs a display; without one, a virtual display is started with Xvfb if it is installed,
+# otherwise the drawing benchmarks are skipped.
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+
+import batch
+from explorer import TorusExplorer, DOWN, LEFT, RIGHT
+
+HIGHER_IS_BETTER = {"steps/s": True, "runs/s": True, "ms/step": False, "ms": False}
+
+
+def snake_directions(m, n, count):
+    # Directions of a boustrophedon sweep (see strategies.Snake), which never visits a vertex twice,
+    # so it can be taken in trusted mode as well
+    directions = bytearray()
+    for visited in range(1, min(count, m * n - 1) + 1):
+        if visited % n:
+            directions.append(RIGHT if (visited // n) % 2 == 0 else LEFT)
+        else:
+            directions.append(DOWN)
+    return directions
+
+
+def random_directions(count, seed=0):
+    rng = random.Random(seed)
+    return bytearray(rng.randrange(4) for _ in range(count))
+
+
+def best_of(repeat, run):
+    # Shortest time of several runs, which is the least disturbed by other processes
+    return min(run() for _ in range(repeat))
+
+
+def bench_engine(size, trusted, max_steps, repeat):
+    m = n = size
+    start = time.perf_counter()
+    TorusExplorer(m, n, trusted)  # builds the graph, which is cached for the runs below
+    setup = time.perf_counter() - start
+    directions = snake_directions(m, n, max_steps) if trusted else random_directions(max_steps)
+
+    # A sweep in trusted mode ends after mn - 1 steps, so on small tori it is taken again on a new
+    # explorer until max_steps steps are timed; creating the explorers is not timed
+    rounds = max(1, max_steps // max(len(directions), 1))
+
+    def run():
+        seconds = 0.0
+        for _ in range(rounds):
+            explorer = TorusExplorer(m, n, trusted)
+            explorer.begin()
+            step = explorer.step
+            start = time.perf_counter()
+            for direction in directions:
+                step(direction)
+            seconds += time.perf_counter() - start
+        return seconds
+
+    seconds = best_of(repeat, run)
+    steps = rounds * len(directions)
+    return {"benchmark": "engine", "mode": "trusted" if trusted else "untrusted", "m": m, "n": n,
+            "steps": steps, "seconds": seconds, "setup_seconds": setup,
+            "value": steps / seconds, "unit": "steps/s"}
+
+
+def bench_sweep(workers, sizes, repeat):
+    args = argparse.Namespace(graph=["torus"], m=sizes, n=sizes, starts="origin", seed=0,
+                              strategy=["nearest", "dfs", "advice"], advice=["random"], error_rate=[0.1])
+    instances = list(batch.instances(args))
+
+    def run():
+        start = time.perf_counter()
+        for _ in batch.sweep(iter(instances), workers):
+            pass
+        return time.perf_counter() - start
+
+    seconds = best_of(repeat, run)
+    return {"benchmark": "sweep", "workers": workers, "runs": len(instances), "seconds": seconds,
+            "value": len(instances) / seconds, "unit": "runs/s"}
+
+
+@contextlib.contextmanager
+def display():
+    # Yields whether there is a display, starting Xvfb if needed and possible
+    if os.environ.get("DISPLAY"):
+        yield True
+        return
+    if not shutil.which("Xvfb"):
+        yield False
+        return
+    number = ":%d" % (99 + os.getpid() % 100)
+    server = subprocess.Popen(["Xvfb", number, "-screen", "0", "1920x1200x24"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = number
+    try:
+        time.sleep(1)  # until the server accepts connections
+        yield True
+    finally:
+        del os.environ["DISPLAY"]
+        server.terminate()
+        server.wait()
+
+
+def bench_drawing(module, size, max_steps):
+    # Time per arrow key press, including the drawing by Tk, and of drawing the whole state at once
+    import tkinter as tk
+    root = tk.Tk()
+    try:
+        app = module.CircleGridApp(root)
+        app.entry_m.insert(0, str(size))
+        app.entry_n.insert(0, str(size))
+        root.update()
+        app.generate_grid()
+        app.fill_highlighted_circle(None)
+        root.update()
+
+        directions = snake_directions(size, size, max_steps)
+        start = time.perf_counter()
+        for direction in directions:
+            app.move_highlighted_circle(None, direction)
+            root.update_idletasks()
+        step_seconds = (time.perf_counter() - start) / max(len(directions), 1)
+
+        start = time.perf_counter()
+        app.redraw()
+        root.update_idletasks()
+        redraw_seconds = time.perf_counter() - start
+        items = len(app.canvas.find_all())
+    finally:
+        root.destroy()
+    mode = module.__name__
+    return [
+        {"benchmark": "draw_step", "mode": mode, "m": size, "n": size, "steps": len(directions),
+         "canvas_items": items, "value": 1000 * step_seconds, "unit": "ms/step"},
+        {"benchmark": "redraw", "mode": mode, "m": size, "n": size, "steps": len(directions),
+         "canvas_items": items, "value": 1000 * redraw_seconds, "unit": "ms"},
+    ]
+
+
+def result_key(result):
+    return tuple((field, result[field]) for field in ("benchmark", "mode", "m", "n", "workers") if field in result)
+
+
+def compare(results, baseline, tolerance):
+    # Prints the change of every result against the baseline, returns the number of regressions
+    old = {result_key(result): result for result in baseline["results"]}
+    regressions = 0
+    for result in results:
+        previous = old.get(result_key(result))
+        if previous is None or previous["unit"] != result["unit"]:
+            continue
+        ratio = result["value"] / previous["value"] if previous["value"] else float("inf")
+        if not HIGHER_IS_BETTER[result["unit"]]:
+            ratio = 1 / ratio if ratio else float("inf")
+        worse = ratio < 1 - tolerance
+        regressions += worse
+        name = " ".join(f"{field}={value}" for field, value in result_key(result))
+        print(f"{name:50} {previous['value']:12.4g} -> {result['value']:12.4g} {result['unit']:8}"
+              f" {ratio:6.2f}x{'  REGRESSION' if worse else ''}", file=sys.stderr)
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the exploration engine, batch sweeps and drawing.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 50, 100, 500, 1000, 2000],
+                        help="side lengths of the tori for the engine benchmark")
+    parser.add_argument("--max-steps", type=int, default=200000, help="steps per engine run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the fastest one counts")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 0], help="processes for the sweep, 0 for one per CPU")
+    parser.add_argument("--draw-sizes", nargs="+", type=int, default=[10, 100, 500],
+                        help="side lengths of the tori for the drawing benchmark")
+    parser.add_argument("--draw-steps", type=int, default=2000, help="arrow key presses per drawing run")
+    parser.add_argument("--skip", nargs="+", default=[], choices=["engine", "sweep", "draw"])
+    parser.add_argument("--output", default="-", help="JSON file or - for stdout")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = []
+    if "engine" not in args.skip:
+        for size in args.sizes:
+            for trusted in (True, False):
+                results.append(bench_engine(size, trusted, args.max_steps, args.repeat))
+                print(f"engine {size}x{size} {results[-1]['mode']}: {results[-1]['value']:.0f} steps/s", file=sys.stderr)
+    if "sweep" not in args.skip:
+        for workers in sorted({workers or os.cpu_count() for workers in args.workers}):
+            results.append(bench_sweep(workers, list(range(10, 30)), args.repeat))
+            print(f"sweep {results[-1]['workers']} workers: {results[-1]['value']:.1f} runs/s", file=sys.stderr)
+    skipped = []
+    if "draw" not in args.skip:
+        with display() as available:
+            if available:
+                import trusted
+                import untrusted
+                for module in (trusted, untrusted):
+                    for size in args.draw_sizes:
+                        results.extend(bench_drawing(module, size, args.draw_steps))
+                        print(f"draw {size}x{size} {module.__name__}: {results[-2]['value']:.3f} ms/step, "
+                              f"redraw {results[-1]['value']:.1f} ms", file=sys.stderr)
+            else:
+                skipped.append("draw")
+                print("draw: skipped, there is no display and Xvfb is not installed", file=sys.stderr)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "skipped": skipped,
+        "results": results,
+    }
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=1)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# On-disk cache of exploration results, so that a sweep only runs the instances that no earlier
+# sweep has run. Results are stored in SQLite under a hash of the canonical form of their instance
+# and evicted least recently used first once the cache grows beyond its size limit.
+#
+# The canonical form uses the symmetries of the torus under which a strategy gives the same
+# results: a strategy that only depends on positions relative to v_0 (all strategies in
+# strategies.py) gives the same results for every v_0, so v_0 is translated to vertex 0.
+# Strategies may also declare "reflection" and "transpose" (m x n to n x m) in their symmetries.
+# None of the current ones does, since they break ties in the order up, down, left, right and
+# the snake sweeps rows, which reflections and transposition do not preserve.
+import hashlib
+import json
+import sqlite3
+
+from advice import ORACLES
+from strategies import STRATEGIES
+
+CACHE_VERSION = 1  # part of every key; increase it when a change of the explorers changes their results
+
+
+def uses_randomness(strategy, advice, error_rate):
+    # Without wrong advice, no strategy draws random numbers and the seed does not matter
+    return STRATEGIES[strategy].uses_advice and ORACLES[advice.partition(":")[0]].uses_error_rate and error_rate > 0
+
+
+def canonical_instance(m, n, start, strategy, advice, error_rate, seed, graph="torus"):
+    symmetries = STRATEGIES[strategy].symmetries
+    row, col = divmod(start, n)
+    if "translation" in symmetries:
+        if graph == "torus":
+            row = col = 0
+        elif graph == "cylinder":  # only the columns wrap around
+            col = 0
+    if "reflection" in symmetries:
+        if graph != "torus":
+            row = min(row, m - 1 - row)
+        if graph == "grid":
+            col = min(col, n - 1 - col)
+    if "transpose" in symmetries and graph in ("torus", "grid") and m > n:
+        m, n, row, col = n, m, col, row
+    if not uses_randomness(strategy, advice, error_rate):
+        seed = None
+    return CACHE_VERSION, graph, m, n, row * n + col, strategy, advice, error_rate, seed
+
+
+def instance_key(instance):
+    return hashlib.blake2b(repr(canonical_instance(*instance)).encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, path, max_bytes=256 * 2**20):
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS results "
+                                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, used INTEGER NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+        # total size of the keys and values, and a counter that orders the uses of results
+        self.size, self.clock = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(used), 0) FROM results").fetchone()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0  # since the last commit
+
+    def get(self, key):
+        row = self.connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.clock += 1
+        self.connection.execute("UPDATE results SET used = ? WHERE key = ?", (self.clock, key))
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        value = json.dumps(value)
+        size = len(key) + len(value)
+        old = self.connection.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+        if old is not None:
+            self.size -= old[0]
+        self.clock += 1
+        self.connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (key, value, size, self.clock))
+        self.size += size
+        if self.size > self.max_bytes:
+            self.evict(self.max_bytes * 9 // 10)
+        self.writes += 1
+        if self.writes >= 1000:  # an interrupted sweep keeps most of its results
+            self.connection.commit()
+            self.writes = 0
+
+    def evict(self, target):
+        # Removes the least recently used results until the size is at most target
+        removed = []
+        for key, size in self.connection.execute("SELECT key, size FROM results ORDER BY used"):
+            if self.size <= target:
+                break
+            removed.append((key,))
+            self.size -= size
+        self.connection.executemany("DELETE FROM results WHERE key = ?", removed)
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
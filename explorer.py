@@ -0,0 +1,174 @@
+# Exploration state of a torus (or another graph from graphs.py), independent of any GUI.
+# trusted.py and untrusted.py draw this state on a canvas; batch jobs use it directly.
+from array import array
+
+from graphs import UP, DOWN, LEFT, RIGHT, DIRECTIONS, grid_graph
+
+BEGIN = 0xFF  # choice of v_0 in the redo stack
+
+
+class Explorer:
+    def __init__(self, graph, trusted=False):
+        if graph.ports >= BEGIN:
+            raise ValueError(f"vertices can have at most {BEGIN - 1} ports")
+        self.graph = graph
+        self.m = graph.m  # number of rows (m)
+        self.n = graph.n  # number of columns (n)
+        self.size = graph.size  # number of vertices
+        self.ports = graph.ports  # steps go to port 0 .. ports - 1, the directions on grid-like graphs
+        self.neighbor = graph.neighbor  # neighbor(index, port), -1 if there is no such edge
+        self.neighbors = graph.neighbors
+        self.trusted = trusted  # with trusted advice, no vertex can be visited twice
+        self.position = 0  # index of the vertex the explorer is on
+        self.start = None  # index of v_0, None until the exploration has started
+        self.visits = array('H', bytes(2 * self.size))  # number of visits of each vertex
+        self.visited_count = 0  # number of distinct visited vertices
+        # number of the visit (counting from 1) in which a vertex was seen as a neighbor, 0 if it is not familiar;
+        # this is all that is needed to undo a step, so no per-step history is kept
+        self.familiar = array('I', bytes(4 * self.size))
+        self.familiar_count = 0  # number of familiar vertices
+        self.walk = array('I')  # indices of the visited vertices in the order of the walk
+        self.moves = bytearray()  # direction of every step after v_0
+        self.redo_moves = bytearray()  # directions of the undone steps, the last one is redone first
+
+    def place(self, index):
+        # Moves the explorer to any vertex while v_0 is still being chosen
+        if self.start is not None or not 0 <= index < self.size:
+            return False
+        self.position = index
+        del self.redo_moves[:]
+        return True
+
+    def begin(self):
+        # Marks the current position as v_0, returns the newly familiar vertices
+        if self.start is not None:
+            return None
+        del self.redo_moves[:]
+        self.start = self.position
+        return self.visit()
+
+    def can_move(self, index):
+        if not self.trusted or not self.visits[index]:
+            return True
+        # Returning to v_0 closes the Hamiltonian cycle once every vertex has been visited
+        return index == self.start and self.visited_count == self.size
+
+    def step(self, direction):
+        # Returns the newly familiar vertices, or None if the move is not allowed
+        new_familiars = self.move(direction)
+        if new_familiars is not None and self.redo_moves:
+            del self.redo_moves[:]  # a new step replaces the undone ones
+        return new_familiars
+
+    def move(self, direction):
+        new_index = self.neighbor(self.position, direction)
+        if new_index < 0:  # no edge, at the border of a grid
+            return None
+        if self.start is None:  # still choosing v_0
+            self.position = new_index
+            return []
+        if not self.can_move(new_index):
+            return None
+        self.position = new_index
+        self.moves.append(direction)
+        return self.visit()
+
+    def visit(self):
+        index = self.position
+        count = self.visits[index]
+        if not count:
+            self.visited_count += 1
+        elif count == 0xFFFF:  # 16 bits are not enough anymore
+            self.visits = array('I', self.visits)
+        self.visits[index] = count + 1
+        self.walk.append(index)
+
+        visits = self.visits
+        familiar = self.familiar
+        number = len(self.walk)
+        new_familiars = []
+        for neighbor_index in self.neighbors(index):
+            if not visits[neighbor_index] and not familiar[neighbor_index]:
+                familiar[neighbor_index] = number
+                new_familiars.append(neighbor_index)
+        self.familiar_count += len(new_familiars)
+        return new_familiars
+
+    def undo(self):
+        # Reverts the last step, returns (undone vertex, previous position, removed familiars)
+        if not self.walk:
+            return None
+        number = len(self.walk)
+        index = self.walk.pop()
+        self.visits[index] -= 1
+        if not self.visits[index]:
+            self.visited_count -= 1
+        familiar = self.familiar
+        new_familiars = []
+        for neighbor_index in self.neighbors(index):
+            if familiar[neighbor_index] == number:
+                familiar[neighbor_index] = 0
+                new_familiars.append(neighbor_index)
+        self.familiar_count -= len(new_familiars)
+        if self.walk:
+            previous = self.position = self.walk[-1]
+            self.redo_moves.append(self.moves.pop())
+        else:  # undoing the choice of v_0
+            previous = self.start = None
+            self.redo_moves.append(BEGIN)
+        return index, previous, new_familiars
+
+    def redo(self):
+        # Takes the last undone step again, returns the newly familiar vertices or None if there is none
+        if not self.redo_moves:
+            return None
+        direction = self.redo_moves.pop()
+        if direction == BEGIN:
+            self.start = self.position
+            return self.visit()
+        return self.move(direction)
+
+    def newly_familiar(self):
+        # Vertices that became familiar in the last step
+        if not self.walk:
+            return []
+        number = len(self.walk)
+        return [neighbor_index for neighbor_index in dict.fromkeys(self.neighbors(self.walk[-1]))
+                if self.familiar[neighbor_index] == number]
+
+    def snapshot(self):
+        # Copy of the per-vertex state; the walk itself is not copied, see restore
+        return self.position, array(self.visits.typecode, self.visits), array('I', self.familiar), \
+            self.visited_count, self.familiar_count
+
+    def restore(self, snapshot, walk, moves):
+        # Restores a snapshot taken after len(walk) visits, walk and moves being the walk up to then
+        position, visits, familiar, self.visited_count, self.familiar_count = snapshot
+        self.position = position
+        self.visits = array(visits.typecode, visits)
+        self.familiar = array('I', familiar)
+        self.walk = walk
+        self.moves = moves
+        self.redo_moves = bytearray()
+        self.start = walk[0] if walk else None
+
+    def is_complete(self):
+        return self.start is not None and self.visited_count == self.size and self.position == self.start
+
+    def tour_length(self):
+        return max(len(self.walk) - 1, 0)
+
+    def revisits(self):
+        # Steps into visited vertices, apart from the step that returns to v_0 and completes the tour
+        return len(self.walk) - self.visited_count - (self.is_complete() and self.size > 1)
+
+    def frontier_size(self):
+        # Familiar vertices that have not been visited yet. Every visited vertex apart from v_0
+        # was familiar before, so this needs no scan of the torus.
+        return self.familiar_count - self.visited_count + 1 if self.start is not None else 0
+
+
+class TorusExplorer(Explorer):
+    # Explorer of an m x n torus, or of another grid-like graph (kind "cylinder" or "grid")
+    def __init__(self, m, n, trusted=False, kind="torus"):
+        super().__init__(grid_graph(kind, m, n), trusted)
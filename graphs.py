@@ -0,0 +1,127 @@
+# Graphs an explorer can run on. Every graph keeps its adjacency in compressed (CSR) arrays:
+# the neighbors of vertex v are targets[offsets[v]:offsets[v + 1]], and a step from v takes
+# one of them by its port, the position in that list. A port without an edge leads to -1.
+#
+# Grid-like graphs (torus, cylinder, grid) have m x n vertices numbered row by row, and their
+# ports are the directions up, down, left and right. On a torus, every vertex has all four
+# neighbors, so looking one up is a single index into the table without any branch.
+import functools
+import itertools
+from array import array
+
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]  # (dx, dy) of up, down, left, right
+
+
+class Graph:
+    # Arbitrary graph given in CSR form; m x n is only used for drawing it, 1 x size by default
+    kind = "csr"
+
+    def __init__(self, offsets, targets, m=None, n=None):
+        self.offsets = array('I', offsets)
+        self.targets = array('i', targets)
+        self.size = len(self.offsets) - 1
+        if self.size < 1 or self.offsets[0] != 0 or self.offsets[-1] != len(self.targets):
+            raise ValueError("offsets must start with 0 and end with the number of targets")
+        if any(not 0 <= target < self.size for target in self.targets):
+            raise ValueError("targets must be vertices of the graph")
+        self.m = m or 1
+        self.n = n or self.size
+        self.ports = max(self.degree(index) for index in range(self.size))  # ports of a vertex are 0 .. ports - 1
+
+    @classmethod
+    def from_edges(cls, size, edges, m=None, n=None):
+        # Undirected graph from (u, v) pairs; ports follow the order of the edges
+        adjacency = [[] for _ in range(size)]
+        for u, v in edges:
+            adjacency[u].append(v)
+            adjacency[v].append(u)
+        offsets = [0]
+        for neighbors in adjacency:
+            offsets.append(offsets[-1] + len(neighbors))
+        return cls(offsets, [v for neighbors in adjacency for v in neighbors], m, n)
+
+    def degree(self, index):
+        return self.offsets[index + 1] - self.offsets[index]
+
+    def neighbor(self, index, port):
+        position = self.offsets[index] + port
+        return self.targets[position] if position < self.offsets[index + 1] else -1
+
+    def neighbors(self, index):
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
+
+
+class GridGraph(Graph):
+    # m x n grid whose rows and columns may wrap around; table has the neighbor (or -1) in each
+    # direction of every vertex, offsets and targets are the same without the missing edges
+    def __init__(self, m, n, wrap_rows, wrap_cols, kind):
+        if m < 1 or n < 1:
+            raise ValueError("m and n must be positive integers")
+        self.kind = kind
+        self.m = m
+        self.n = n
+        self.size = m * n
+        self.ports = 4
+        self.table = direction_table(m, n, wrap_rows, wrap_cols)
+        if wrap_rows and wrap_cols:
+            self.offsets = array('I', range(0, 4 * self.size + 1, 4))
+            self.targets = self.table
+        else:
+            self.targets = array('i', filter((0).__le__, self.table))
+            degrees = [4] * n  # degrees of the vertices of a row
+            if not wrap_cols:
+                degrees[0] -= 1
+                degrees[-1] -= 1
+            border_degrees = [degree - 1 for degree in degrees] if m > 1 else [degree - 2 for degree in degrees]
+            rows = [degrees] * m if wrap_rows else [border_degrees] + [degrees] * (m - 2) + [border_degrees] * (m > 1)
+            self.offsets = array('I', itertools.accumulate(itertools.chain.from_iterable(rows), initial=0))
+
+    def neighbor(self, index, direction):
+        return self.table[4 * index + direction]
+
+
+class TorusGraph(GridGraph):
+    # Regular: every direction has an edge, so the table is the CSR target array as well
+    def __init__(self, m, n):
+        super().__init__(m, n, True, True, "torus")
+
+    def neighbors(self, index):
+        return self.table[4 * index:4 * index + 4]
+
+
+def direction_table(m, n, wrap_rows, wrap_cols):
+    # Every direction is the vertex numbers shifted by a row or a column (array slices, so this
+    # is fast on large grids as well), with the wrapped or missing edges fixed up at the borders
+    size = m * n
+    ids = array('i', range(size))
+    missing_row = array('i', [-1]) * n
+    columns = [
+        (ids[-n:] if wrap_rows else missing_row) + ids[:-n],  # up
+        ids[n:] + (ids[:n] if wrap_rows else missing_row),  # down
+        ids[-1:] + ids[:-1],  # left
+        ids[1:] + ids[:1],  # right
+    ]
+    left, right = columns[LEFT], columns[RIGHT]
+    for row in range(0, size, n):
+        left[row] = row + n - 1 if wrap_cols else -1
+        right[row + n - 1] = row if wrap_cols else -1
+    table = array('i', bytes(16 * size))
+    for direction, column in enumerate(columns):
+        table[direction::4] = column
+    return table
+
+
+GRID_KINDS = {
+    "torus": TorusGraph,
+    "cylinder": lambda m, n: GridGraph(m, n, False, True, "cylinder"),  # columns wrap around, rows do not
+    "grid": lambda m, n: GridGraph(m, n, False, False, "grid"),
+}
+
+
+@functools.lru_cache(maxsize=16)
+def grid_graph(kind, m, n):
+    # The graphs are read-only, so explorers of the same size share them
+    if kind not in GRID_KINDS:
+        raise ValueError(f"unknown graph {kind!r}, expected one of {', '.join(GRID_KINDS)}")
+    return GRID_KINDS[kind](m, n)
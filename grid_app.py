@@ -0,0 +1,326 @@
+# The GUI of trusted.py and untrusted.py, which only differ in the mode of the explorer and the colors.
+import argparse
+import tkinter as tk
+import tkinter.messagebox
+import tkinter.filedialog
+from explorer import TorusExplorer, UP, DOWN, LEFT, RIGHT
+from graphs import GRID_KINDS
+from grid_view import MAX_PATH_STEPS, bind_scroll_and_zoom, create_view, scrollable_canvas
+import profiling
+import walkfile
+
+REPLAY_BUILD_STEPS = 20000  # steps of an opened walk that are replayed at a time while the GUI is idle
+
+
+class GridApp:
+    # The GUI shared by trusted.py and untrusted.py: a torus on a canvas, the exploration of it with
+    # the arrow keys, undo and redo, and saving, opening and replaying walks. Subclasses set the
+    # title and whether the advice is trusted, and choose the color of a visited vertex.
+    title = "Circle Grid Generator"
+    trusted = False  # with trusted advice, no vertex can be visited twice
+
+    def __init__(self, master, max_path_steps=MAX_PATH_STEPS):
+        self.master = master
+        self.max_path_steps = max_path_steps  # longer walks are drawn as a heatmap of the used edges
+        self.master.title(self.title)
+
+        self.label_m = tk.Label(self.master, text="Enter m (rows):")
+        self.label_m.pack()
+
+        self.entry_m = tk.Entry(self.master)
+        self.entry_m.pack()
+
+        self.label_n = tk.Label(self.master, text="Enter n (columns):")
+        self.label_n.pack()
+
+        self.entry_n = tk.Entry(self.master)
+        self.entry_n.pack()
+
+        self.kind = tk.StringVar(self.master, value="torus")  # torus, cylinder (wrapping columns) or grid
+        self.kind_menu = tk.OptionMenu(self.master, self.kind, *GRID_KINDS)
+        self.kind_menu.pack()
+
+        self.canvas = scrollable_canvas(self.master, 1900, 1000)
+        bind_scroll_and_zoom(self.canvas, self.zoom)
+
+        self.generate_button = tk.Button(self.master, text="Generate Grid", command=self.generate_grid)
+        self.generate_button.pack()
+
+        self.m = 0  # number of rows (m)
+        self.n = 0  # number of columns (n)
+        self.view = None  # drawing of the current grid
+        self.highlighted_index = None  # index of the currently highlighted circle
+        self.explorer = None  # exploration state of the current grid
+        self.replay = None  # replay of a loaded walk, until the explorer takes a step of its own
+        self.neighboring_dots = {}  # dictionary to store dot IDs of neighboring circles
+        self.orange_dots = []  # [index, dot ID] of the vertices that became familiar in the last step
+
+        self.master.bind("<Left>", lambda event: self.move_highlighted_circle(event, LEFT))
+        self.master.bind("<Right>", lambda event: self.move_highlighted_circle(event, RIGHT))
+        self.master.bind("<Up>", lambda event: self.move_highlighted_circle(event, UP))
+        self.master.bind("<Down>", lambda event: self.move_highlighted_circle(event, DOWN))
+        self.master.bind("<space>", self.fill_highlighted_circle)
+        self.canvas.bind("<Button-1>", self.select_circle)
+        self.master.bind("<BackSpace>", self.undo_last_action)
+        self.master.bind("<Control-z>", self.undo_last_action)
+        self.master.bind("<Control-y>", self.redo_last_action)
+        self.master.bind("<Return>", self.generate_grid)
+        self.master.bind("<Control-s>", self.save_walk)
+        self.master.bind("<Control-o>", self.open_walk)
+        self.master.bind("<Home>", lambda event: self.seek_walk(0))
+        self.master.bind("<End>", lambda event: self.seek_walk(None))
+        self.master.bind("<Prior>", lambda event: self.skip_walk(-1))
+        self.master.bind("<Next>", lambda event: self.skip_walk(1))
+        self.master.bind("<KeyRelease>", self.remove_spaces)
+
+    def generate_grid(self, event=None):
+        try:
+            self.m = int(self.entry_m.get())
+            self.n = int(self.entry_n.get())
+            explorer = TorusExplorer(self.m, self.n, trusted=self.trusted, kind=self.kind.get())
+        except ValueError:
+            tkinter.messagebox.showerror("Error", "Please enter valid integers for m and n.")
+            return
+        
+        self.canvas.delete("all")
+        self.explorer = explorer
+        self.replay = None
+        self.neighboring_dots = {}
+        self.orange_dots = []
+
+        # Cells are as large as possible such that the grid fits on the canvas
+        self.view = create_view(self.canvas, self.m, self.n, self.max_path_steps)
+        self.highlight_circle(0)
+
+    def highlight_circle(self, index):
+        self.view.highlight(index)
+        self.highlighted_index = index
+
+    def unhighlight_circle(self, index):
+        self.view.unhighlight(index)
+        self.highlighted_index = None
+
+    def select_circle(self, event):
+        # Clicking a vertex moves the highlight there while v_0 is not chosen yet
+        if self.highlighted_index is None:
+            return
+        index = self.view.index_at(event)
+        if index is not None and self.explorer.place(index):
+            self.unhighlight_circle(self.highlighted_index)
+            self.highlight_circle(index)
+
+    def fill_highlighted_circle(self, event):
+        if self.highlighted_index is None:
+            return
+        new_familiars = self.explorer.begin()
+        if new_familiars is None:
+            return
+        self.replay = None
+        self.draw_begin(new_familiars)
+
+    def move_highlighted_circle(self, event, direction):
+        if self.highlighted_index is None:
+            return
+        
+        current_index = self.explorer.position
+        new_familiars = self.explorer.step(direction)
+        if new_familiars is None:
+            return
+        self.replay = None
+        self.draw_step(current_index, new_familiars)
+
+    def vertex_color(self, index):
+        # Fill color of a vertex, white if it has not been visited
+        raise NotImplementedError
+
+    def draw_begin(self, new_familiars):
+        self.view.fill(self.explorer.start, self.vertex_color(self.explorer.start))
+        self.orange_dots = self.mark_neighboring_circles(new_familiars)
+
+    def draw_step(self, current_index, new_familiars):
+        new_index = self.explorer.position
+        self.update_neighboring_dots()
+        self.unhighlight_circle(current_index)
+        self.highlight_circle(new_index)
+
+        if self.explorer.start is not None:
+            self.orange_dots = self.mark_neighboring_circles(new_familiars)
+            self.view.draw_step(current_index, new_index)
+            self.view.fill(new_index, self.vertex_color(new_index))
+
+    # Undo and redo take the changes of a step from the explorer (the visited vertex and the
+    # vertices that became familiar in it) and the path takes back its last step, so both are O(1)
+    # per step no matter how long the walk is.
+
+    def undo_last_action(self, event=None):
+        if self.explorer is None:
+            return
+        undone = self.explorer.undo()
+        if undone is None:
+            return
+        self.replay = None
+        index, previous, new_familiars = undone
+        if previous is not None:
+            self.view.undo_step(previous, index)
+        for neighbor_index in new_familiars:
+            self.view.delete_dot(self.neighboring_dots.pop(neighbor_index))
+        self.view.fill(index, self.vertex_color(index))
+
+        self.orange_dots = []
+        if previous is not None:
+            for neighbor_index in self.explorer.newly_familiar():
+                dot_id = self.neighboring_dots[neighbor_index]
+                self.view.color_dot(dot_id, 'orange')
+                self.orange_dots.append([neighbor_index, dot_id])
+            self.unhighlight_circle(index)
+            self.highlight_circle(previous)
+
+    def redo_last_action(self, event=None):
+        if self.explorer is None:
+            return
+        current_index = self.explorer.position
+        new_familiars = self.explorer.redo()
+        if new_familiars is None:
+            return
+        self.replay = None
+        if len(self.explorer.walk) == 1:
+            self.draw_begin(new_familiars)
+        else:
+            self.draw_step(current_index, new_familiars)
+
+    def undo_steps(self, count):
+        # Goes back (count < 0) or forward (count > 0) by up to |count| steps
+        action = self.undo_last_action if count < 0 else self.redo_last_action
+        for _ in range(abs(count)):
+            action()
+
+    def mark_neighboring_circles(self, new_familiars):
+        dots = []
+        for neighbor_index in new_familiars:
+            dot_id = self.view.create_dot(neighbor_index, 'orange')
+            self.neighboring_dots[neighbor_index] = dot_id
+            dots.append([neighbor_index, dot_id])
+        return dots
+
+    def update_neighboring_dots(self):
+        # Only the dots of the last step are orange, all older ones are black already
+        for index, dot_id in self.orange_dots:
+            self.view.color_dot(dot_id, 'black')
+        self.orange_dots = []
+
+    def redraw(self):
+        # Draws the state of the explorer from scratch, e.g. after jumping to another step of a walk
+        explorer = self.explorer
+        self.canvas.delete("all")
+        self.view = create_view(self.canvas, self.m, self.n, self.max_path_steps)
+        self.neighboring_dots = {}
+        self.orange_dots = []
+        if explorer.start is not None:
+            for index in range(explorer.size):
+                if explorer.visits[index]:
+                    self.view.fill(index, self.vertex_color(index))
+            last = len(explorer.walk)
+            for index in range(explorer.size):
+                number = explorer.familiar[index]
+                if number:
+                    dot_id = self.view.create_dot(index, 'orange' if number == last else 'black')
+                    self.neighboring_dots[index] = dot_id
+                    if number == last:
+                        self.orange_dots.append([index, dot_id])
+            self.view.draw_walk(explorer.walk)
+        self.highlight_circle(explorer.position)
+
+    def save_walk(self, event=None):
+        if self.explorer is None or self.explorer.start is None:
+            tkinter.messagebox.showerror("Error", "Please start an exploration first.")
+            return
+        path = tkinter.filedialog.asksaveasfilename(defaultextension=".walk", filetypes=[("Walks", "*.walk")])
+        if path:
+            walkfile.save_walk(path, walkfile.Walk.from_explorer(self.explorer))
+
+    def open_walk(self, event=None):
+        path = tkinter.filedialog.askopenfilename(filetypes=[("Walks", "*.walk"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            walk = walkfile.load_walk(path)
+            walk.trusted = self.trusted
+            replay = walkfile.WalkReplay(walk)
+        except (OSError, ValueError) as error:
+            tkinter.messagebox.showerror("Error", f"Cannot load the walk: {error}")
+            return
+
+        self.m, self.n = walk.m, walk.n
+        for entry, value in ((self.entry_m, walk.m), (self.entry_n, walk.n)):
+            entry.delete(0, tk.END)
+            entry.insert(0, str(value))
+        self.kind.set(walk.kind)
+        self.replay = replay
+        self.explorer = replay.explorer
+        self.redraw()
+        self.build_replay(replay)
+
+    def build_replay(self, replay):
+        # Takes the snapshots of an opened walk a part at a time while the GUI is idle, so that it
+        # opens at v_0 at once and later jumps only replay the steps since the closest snapshot
+        if replay is not self.replay:  # another walk or grid replaced it
+            return
+        if replay.build(REPLAY_BUILD_STEPS):
+            self.master.after(1, self.build_replay, replay)
+        elif replay.error is not None:
+            tkinter.messagebox.showwarning("Warning", f"The walk ends early: {replay.error}.")
+
+    def seek_walk(self, step):
+        # Jumps to a step of the loaded walk, 0 is v_0 and None the end
+        if self.replay is None:
+            return
+        self.replay.seek(len(self.replay) if step is None else step)
+        self.redraw()
+
+    def skip_walk(self, direction):
+        # Goes back (-1) or forward (1) by 2% of the loaded walk, or of the walk including
+        # the undone steps if there is no loaded walk
+        if self.replay is not None:
+            self.seek_walk(self.replay.current() + direction * max(1, len(self.replay) // 50))
+        elif self.explorer is not None:
+            length = len(self.explorer.walk) + len(self.explorer.redo_moves)
+            self.undo_steps(direction * max(1, length // 50))
+
+    def zoom(self, factor, x, y):
+        if self.view is not None:
+            self.view.zoom(factor, x, y)
+
+    def reset_highlighted_circle(self):
+        if self.highlighted_index is not None:
+            self.unhighlight_circle(self.highlighted_index)
+
+    def clear_canvas(self):
+        self.canvas.delete("all")
+        self.explorer = None
+        self.replay = None
+        self.view = None
+        
+    def remove_spaces(self, event):
+        content_n = self.entry_n.get()
+        content_m = self.entry_m.get()
+        new_content_n = content_n.replace(" ", "")
+        new_content_m = content_m.replace(" ", "")
+        if content_n != new_content_n:
+            self.entry_n.delete(0, tk.END)
+            self.entry_n.insert(0, new_content_n)
+        if content_m != new_content_m:
+            self.entry_m.delete(0, tk.END)
+            self.entry_m.insert(0, new_content_m)
+
+def main(app_class, description, argv=None):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--max-path-steps", type=int, default=MAX_PATH_STEPS,
+                        help="steps drawn as a path, longer walks are drawn as a heatmap of the used edges")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    root = tk.Tk()
+    app = app_class(root, args.max_path_steps)
+    profiler = profiling.Profiler() if args.metrics else None
+    if profiler is not None:
+        profiler.attach_app(app)
+    profiling.run_main(args, root.mainloop, profiler)
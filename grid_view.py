@@ -0,0 +1,534 @@
+# Drawing a torus on a tkinter canvas, shared by trusted.py and untrusted.py.
+# Small tori are drawn with one circle per vertex. If the circles would get too small,
+# the vertices are drawn as cells of a single bitmap image instead, so that the number
+# of canvas items does not depend on the size of the torus.
+import tkinter as tk
+
+MAX_CELL = 80  # size of the original layout: circles of radius 20 with a spacing of 40
+MIN_CIRCLE_CELL = 16  # below this cell size (in pixels), the bitmap is used
+MAX_IMAGE_SIZE = 4096  # largest width or height of the bitmap in pixels
+MAX_PATH_STEPS = 20000  # steps drawn as a path; longer walks are drawn as a heatmap of the used edges
+MAX_POLYLINE_STEPS = 256  # steps of one polyline, so that extending it stays cheap
+HEAT_COLORS = ["#fdd49e", "#fdbb84", "#fc8d59", "#ef6548", "#d7301f", "#b30000", "#7f0000"]  # 1, 2-3, 4-7, ... steps
+
+
+def scrollable_canvas(master, width, height):
+    frame = tk.Frame(master)
+    canvas = tk.Canvas(frame, width=width, height=height, bg='white')
+    xscroll = tk.Scrollbar(frame, orient=tk.HORIZONTAL, command=lambda *args: scroll(canvas, canvas.xview, *args))
+    yscroll = tk.Scrollbar(frame, orient=tk.VERTICAL, command=lambda *args: scroll(canvas, canvas.yview, *args))
+    canvas.configure(xscrollcommand=xscroll.set, yscrollcommand=yscroll.set)
+    canvas.grid(row=0, column=0, sticky='nsew')
+    yscroll.grid(row=0, column=1, sticky='ns')
+    xscroll.grid(row=1, column=0, sticky='ew')
+    frame.pack()
+    return canvas
+
+
+def scroll(canvas, view, *args):
+    # Scrolls with canvas.xview or canvas.yview and tells the view that other parts are visible now
+    view(*args)
+    canvas.event_generate("<<Scrolled>>")
+
+
+def bind_scroll_and_zoom(canvas, zoom):
+    # Mouse wheel scrolls (with shift horizontally), control + mouse wheel calls zoom(factor, x, y)
+    def wheel(event, delta):
+        x, y = canvas.canvasx(event.x), canvas.canvasy(event.y)
+        if event.state & 0x4:  # control
+            zoom(1.25 if delta > 0 else 0.8, x, y)
+        elif event.state & 0x1:  # shift
+            scroll(canvas, canvas.xview_scroll, -1 if delta > 0 else 1, 'units')
+        else:
+            scroll(canvas, canvas.yview_scroll, -1 if delta > 0 else 1, 'units')
+
+    canvas.bind("<MouseWheel>", lambda event: wheel(event, event.delta))
+    canvas.bind("<Button-4>", lambda event: wheel(event, 1))
+    canvas.bind("<Button-5>", lambda event: wheel(event, -1))
+
+
+def create_view(canvas, m, n, max_path_steps=MAX_PATH_STEPS):
+    # Largest cell size with which the whole torus fits on the visible canvas
+    cell = min(canvas.winfo_width() / n, canvas.winfo_height() / m, MAX_CELL)
+    if cell >= MIN_CIRCLE_CELL:
+        return CircleView(canvas, m, n, cell, max_path_steps)
+    return BitmapView(canvas, m, n, max(1, int(cell)), max_path_steps)
+
+
+class GridView:
+    def __init__(self, canvas, m, n, cell, total_width, total_height, max_path_steps=MAX_PATH_STEPS):
+        self.canvas = canvas
+        self.m = m
+        self.n = n
+        self.cell = cell  # distance between the centers of neighboring vertices
+        self.offset = cell / 2  # distance of the center of a vertex from the corner of its cell
+        # the grid is centered on the visible canvas as long as it fits, otherwise it starts at 0
+        self.x0 = max((canvas.winfo_width() - total_width) / 2, 0)
+        self.y0 = max((canvas.winfo_height() - total_height) / 2, 0)
+        self.path = PathLayer(self, max_path_steps)  # the steps of the walk
+        canvas.bind("<<Scrolled>>", lambda event: self.path.show_visible())
+
+    def center(self, index):
+        row, col = divmod(index, self.n)
+        return self.x0 + col * self.cell + self.offset, self.y0 + row * self.cell + self.offset
+
+    def update_scrollregion(self):
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        self.path.show_visible()
+
+    def visible(self, coords):
+        # Whether the bounding box of the points coords (x0, y0, x1, y1, ...) is on the visible canvas
+        left, top = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        right, bottom = self.canvas.canvasx(self.canvas.winfo_width()), self.canvas.canvasy(self.canvas.winfo_height())
+        xs, ys = coords[0::2], coords[1::2]
+        return min(xs) <= right and max(xs) >= left and min(ys) <= bottom and max(ys) >= top
+
+    def scale(self, factor, x, y):
+        # Scales all canvas items around (x, y), see Canvas.scale
+        self.canvas.scale("all", x, y, factor, factor)
+        self.x0 = x + (self.x0 - x) * factor
+        self.y0 = y + (self.y0 - y) * factor
+        self.cell *= factor
+        self.offset *= factor
+        self.path.scale()
+
+    def is_wrap(self, start_index, end_index):
+        # Whether a step wraps around the torus (or is a loop), so it is not drawn as a straight line
+        (start_row, start_col), (end_row, end_col) = divmod(start_index, self.n), divmod(end_index, self.n)
+        return start_index == end_index or abs(start_row - end_row) > 1 or abs(start_col - end_col) > 1
+
+    def arrow_width(self):
+        return 2 if self.cell >= MIN_CIRCLE_CELL else 1
+
+    def arrow_head(self):
+        return 'last' if self.cell >= MIN_CIRCLE_CELL / 2 else 'none'
+
+    def arrow_coords(self, start_index, end_index):
+        # Start, control point and end of the curve of a step
+        start_x, start_y = self.center(start_index)
+        end_x, end_y = self.center(end_index)
+
+        if start_index % self.n == 0 and end_index % self.n == self.n - 1:  # Left to right edge
+            control_x = start_x + (end_x - start_x) / 2  # Control point to create a curve
+            control_y = start_y - self.cell
+        elif start_index % self.n == self.n - 1 and end_index % self.n == 0:  # Right to left edge
+            control_x = start_x + (end_x - start_x) / 2  # Control point to create a curve
+            control_y = start_y - self.cell
+        elif start_index // self.n == 0 and end_index // self.n == self.m - 1:  # Top to bottom edge
+            control_x = start_x - self.cell
+            control_y = start_y + (end_y - start_y) / 2  # Control point to create a curve
+        elif start_index // self.n == self.m - 1 and end_index // self.n == 0:  # Bottom to top edge
+            control_x = start_x - self.cell
+            control_y = start_y + (end_y - start_y) / 2  # Control point to create a curve
+        else:
+            control_x = (start_x + end_x) / 2
+            control_y = (start_y + end_y) / 2
+        return start_x, start_y, control_x, control_y, end_x, end_y
+
+    def draw_arrow(self, start_index, end_index):
+        return self.canvas.create_line(*self.arrow_coords(start_index, end_index), fill='black',
+                                       width=self.arrow_width(), arrow=self.arrow_head(), smooth=1)
+
+    def delete_arrow(self, arrow_id):
+        self.canvas.delete(arrow_id)
+
+    def create_heatmap(self, usage):
+        return HeatLines(self)
+
+    def draw_step(self, start_index, end_index):
+        self.path.push(start_index, end_index)
+
+    def undo_step(self, start_index, end_index):
+        self.path.pop(start_index, end_index)
+
+    def draw_walk(self, walk):
+        self.path.draw_walk(walk)
+
+
+class PathLayer:
+    # The steps of a walk with a bounded number of canvas items. Consecutive steps are merged into
+    # polylines with one point per turn, and a step that wraps around the torus is drawn as a
+    # curved arrow once, however often it is taken, and only once it is visible. Beyond max_steps
+    # steps, the path is replaced by a heatmap of the used edges, colored by the number of steps
+    # over them (see view.create_heatmap).
+    def __init__(self, view, max_steps=MAX_PATH_STEPS):
+        self.view = view
+        self.canvas = view.canvas
+        self.max_steps = max_steps
+        self.steps = 0
+        self.usage = {}  # number of steps over every edge, as (smaller, larger vertex)
+        # [polyline ID, vertices, points] of the drawn stretches of the walk, or [None, (start, end), None] of a wrap step
+        self.lines = []
+        self.wraps = {}  # [arrow ID or None while not visible, number of steps] of every wrap step
+        self.heatmap = None  # HeatLines or HeatImage once the walk is drawn as a heatmap
+
+    def push(self, start_index, end_index):
+        self.steps += 1
+        edge = (start_index, end_index) if start_index <= end_index else (end_index, start_index)
+        count = self.usage.get(edge, 0) + 1
+        self.usage[edge] = count
+        if self.heatmap is not None:
+            self.heatmap.update(edge, count, count - 1)
+        elif self.steps > self.max_steps:
+            self.show_heatmap()
+        elif self.view.is_wrap(start_index, end_index):
+            step = (start_index, end_index)
+            self.lines.append([None, step, None])
+            wrap = self.wraps.setdefault(step, [None, 0])
+            wrap[1] += 1
+            if wrap[0] is None and self.view.visible(self.view.arrow_coords(*step)):
+                wrap[0] = self.view.draw_arrow(*step)
+        else:
+            line = self.lines[-1] if self.lines else None
+            if line is None or line[0] is None or line[1][-1] != start_index or len(line[1]) > MAX_POLYLINE_STEPS:
+                line = [self.canvas.create_line(0, 0, 0, 0, fill='black', width=self.view.arrow_width(),
+                                                arrow=self.view.arrow_head()), [start_index], list(self.view.center(start_index))]
+                self.lines.append(line)
+            item, vertices, points = line
+            if len(vertices) > 1 and end_index - start_index == start_index - vertices[-2]:
+                points[-2:] = self.view.center(end_index)  # straight on, the last point moves
+            else:
+                points.extend(self.view.center(end_index))
+            vertices.append(end_index)
+            self.canvas.coords(item, *points)
+
+    def pop(self, start_index, end_index):
+        # Removes the last step, which went from start_index to end_index
+        self.steps -= 1
+        edge = (start_index, end_index) if start_index <= end_index else (end_index, start_index)
+        count = self.usage[edge] - 1
+        if count:
+            self.usage[edge] = count
+        else:
+            del self.usage[edge]
+        if self.heatmap is not None:
+            self.heatmap.update(edge, count, count + 1)
+            return
+        item, vertices, points = self.lines[-1]
+        if item is None:
+            self.lines.pop()
+            wrap = self.wraps[vertices]
+            wrap[1] -= 1
+            if not wrap[1]:
+                if wrap[0] is not None:
+                    self.canvas.delete(wrap[0])
+                del self.wraps[vertices]
+            return
+        vertices.pop()
+        if len(vertices) > 1:
+            self.update_line(self.lines[-1])
+        else:
+            self.canvas.delete(item)
+            self.lines.pop()
+
+    def update_line(self, line):
+        # Sets the points of a polyline to its first and last vertex and every turn in between
+        item, vertices, points = line
+        center = self.view.center
+        points[:] = center(vertices[0])
+        direction = None
+        for previous, vertex in zip(vertices, vertices[1:]):
+            if vertex - previous == direction:
+                points[-2:] = center(vertex)
+            else:
+                points.extend(center(vertex))
+            direction = vertex - previous
+        self.canvas.coords(item, *points)
+
+    def scale(self):
+        # The canvas scaled the items, the points of the polylines follow the new centers
+        for line in self.lines:
+            if line[0] is not None:
+                self.update_line(line)
+
+    def show_visible(self):
+        # Draws the wrap steps that have become visible, e.g. after scrolling
+        for step, wrap in self.wraps.items():
+            if wrap[0] is None and self.view.visible(self.view.arrow_coords(*step)):
+                wrap[0] = self.view.draw_arrow(*step)
+
+    def show_heatmap(self):
+        for item, _, _ in self.lines:
+            if item is not None:
+                self.canvas.delete(item)
+        for item, _ in self.wraps.values():
+            if item is not None:
+                self.canvas.delete(item)
+        self.lines = []
+        self.wraps = {}
+        self.heatmap = self.view.create_heatmap(self.usage)
+        for edge, count in self.usage.items():
+            self.heatmap.update(edge, count, 0)
+
+    def draw_walk(self, walk):
+        # Draws a whole walk (the visited vertices in order) at once
+        if len(walk) - 1 <= self.max_steps:
+            for number in range(1, len(walk)):
+                self.push(walk[number - 1], walk[number])
+            return
+        usage = self.usage
+        for number in range(1, len(walk)):
+            start_index, end_index = walk[number - 1], walk[number]
+            edge = (start_index, end_index) if start_index <= end_index else (end_index, start_index)
+            usage[edge] = usage.get(edge, 0) + 1
+        self.steps += len(walk) - 1
+        self.show_heatmap()
+
+
+def heat_color(count):
+    return HEAT_COLORS[min(count.bit_length(), len(HEAT_COLORS)) - 1]
+
+
+class HeatLines:
+    # The heatmap of CircleView: one line per used edge, so the number of items stays below the
+    # number of edges
+    def __init__(self, view):
+        self.view = view
+        self.canvas = view.canvas
+        self.lines = {}  # line ID of every used edge
+
+    def update(self, edge, count, previous):
+        # Updates the line of an edge that is now used count times instead of previous times
+        item = self.lines.get(edge)
+        if not count:
+            self.canvas.delete(self.lines.pop(edge))
+        elif item is None:
+            if self.view.is_wrap(*edge):
+                coords = self.view.arrow_coords(*edge)
+            else:
+                coords = self.view.center(edge[0]) + self.view.center(edge[1])
+            self.lines[edge] = self.canvas.create_line(*coords, fill=heat_color(count),
+                                                       width=self.view.arrow_width() + 1, smooth=1)
+        elif count.bit_length() != previous.bit_length():
+            self.canvas.itemconfigure(item, fill=heat_color(count))
+
+
+class HeatImage:
+    # The heatmap of BitmapView: the edges are painted into one image on top of the vertices, so
+    # the number of canvas items stays constant. In edges, every vertex has 3 x 3 pixels: the
+    # middle one is the vertex (transparent), the ones left, right, above and below it are the
+    # halves of its edges, so a wrap-around edge is drawn at both borders of the torus. Cells of
+    # fewer than 3 pixels have no room for edges, so then vertices is shown instead, with every
+    # vertex in the color of its busiest edge. Pixels of unused edges are transparent.
+    def __init__(self, view, usage):
+        self.view = view
+        self.canvas = view.canvas
+        self.usage = usage  # number of steps over every edge, see PathLayer
+        m, n = view.m, view.n
+        self.edges = tk.PhotoImage(master=self.canvas, width=3 * n, height=3 * m)
+        self.vertices = tk.PhotoImage(master=self.canvas, width=n, height=m)
+        self.blank = tk.PhotoImage(master=self.canvas, width=1, height=1)  # a transparent pixel
+        self.image = None  # edges or vertices zoomed to the cell size, see show
+        self.image_id = None
+        self.show()
+
+    def show(self):
+        # Creates the image for the current cell size, e.g. after zooming. Zooming the whole edges
+        # image by cell and then subsampling it by 3 would take an image 3 times the size of the
+        # bitmap in each direction, so it is done a row of vertices at a time, in a band that is
+        # at most 3 times as wide as the bitmap and 3 cells high.
+        cell = int(self.view.cell)
+        m, n = self.view.m, self.view.n
+        self.image = tk.PhotoImage(master=self.canvas, width=n * cell, height=m * cell)
+        if cell >= 3:
+            self.source, self.pixels = self.edges, 3  # source image and its pixels per vertex
+            band = tk.PhotoImage(master=self.canvas, width=3 * n * cell, height=3 * cell)
+            for row in range(m):
+                band.blank()
+                self.canvas.tk.call(band, 'copy', self.edges, '-from', 0, 3 * row, 3 * n, 3 * row + 3,
+                                    '-zoom', cell, cell)
+                self.canvas.tk.call(self.image, 'copy', band, '-subsample', 3, 3, '-to', 0, row * cell)
+        else:
+            self.source, self.pixels = self.vertices, 1
+            self.canvas.tk.call(self.image, 'copy', self.vertices, '-zoom', cell, cell)
+        if self.image_id is None:
+            self.image_id = self.canvas.create_image(self.view.x0, self.view.y0, image=self.image, anchor='nw')
+            self.canvas.tag_raise(self.image_id, self.view.image_id)  # below the cursor
+        else:
+            self.canvas.itemconfigure(self.image_id, image=self.image)
+            self.canvas.coords(self.image_id, self.view.x0, self.view.y0)
+
+    def put(self, image, color, x0, y0, x1, y1):
+        if color is not None:
+            image.put(color, to=(x0, y0, x1, y1))
+        else:  # PhotoImage.put cannot make pixels transparent again, copying a transparent one can
+            self.canvas.tk.call(image, 'copy', self.blank, '-to', x0, y0, x1, y1, '-compositingrule', 'set')
+
+    def paint(self, source, color, x, y):
+        # Paints the pixel (x, y) of source and its part of the shown image
+        self.put(source, color, x, y, x + 1, y + 1)
+        if source is self.source:
+            cell, pixels = int(self.view.cell), self.pixels
+            self.put(self.image, color, -(-x * cell // pixels), -(-y * cell // pixels),
+                     -(-(x + 1) * cell // pixels), -(-(y + 1) * cell // pixels))
+
+    def neighbors(self, vertex):
+        # (neighbor, dx, dy) of the four steps from vertex, with (dx, dy) the direction of the step
+        m, n = self.view.m, self.view.n
+        row, col = divmod(vertex, n)
+        return [(row * n + (col + 1) % n, 1, 0), (row * n + (col - 1) % n, -1, 0),
+                ((row + 1) % m * n + col, 0, 1), ((row - 1) % m * n + col, 0, -1)]
+
+    def update(self, edge, count, previous):
+        # Repaints an edge that is now used count times instead of previous times
+        if count and previous and count.bit_length() == previous.bit_length():
+            return
+        color = heat_color(count) if count else None
+        for vertex, other in (edge, edge[::-1]):
+            row, col = divmod(vertex, self.view.n)
+            for neighbor, dx, dy in self.neighbors(vertex):
+                if neighbor == other:
+                    self.paint(self.edges, color, 3 * col + 1 + dx, 3 * row + 1 + dy)
+                    if vertex == other:  # a loop on a torus with one row or column
+                        break
+            busiest = max((self.usage.get((min(vertex, neighbor), max(vertex, neighbor)), 0)
+                           for neighbor, _, _ in self.neighbors(vertex)), default=0)
+            self.paint(self.vertices, heat_color(busiest) if busiest else None, col, row)
+
+
+class CircleView(GridView):
+    # One oval per vertex, with radius cell / 4 (20 for the original cell size of 80)
+    def __init__(self, canvas, m, n, cell, max_path_steps=MAX_PATH_STEPS):
+        super().__init__(canvas, m, n, cell, n * cell - cell / 2, m * cell - cell / 2, max_path_steps)
+        self.offset = cell / 4
+        self.circles = []  # ids of all circles
+        self.circle_index = {}  # vertex index of each circle id
+        radius = cell / 4
+        for index in range(m * n):
+            x, y = self.center(index)
+            circle = canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
+                                        outline='black', width=2, fill='white')
+            self.circle_index[circle] = index
+            self.circles.append(circle)
+        self.update_scrollregion()
+
+    def highlight(self, index):
+        self.canvas.itemconfigure(self.circles[index], width=4)
+
+    def unhighlight(self, index):
+        self.canvas.itemconfigure(self.circles[index], width=2)
+
+    def fill(self, index, color):
+        self.canvas.itemconfigure(self.circles[index], fill=color)
+
+    def create_dot(self, index, color):
+        x, y = self.center(index)
+        radius = max(self.cell * 3 / MAX_CELL, 1.5)
+        return self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius, fill=color)
+
+    def color_dot(self, dot_id, color):
+        self.canvas.itemconfigure(dot_id, fill=color)
+
+    def delete_dot(self, dot_id):
+        self.canvas.delete(dot_id)
+
+    def index_at(self, event):
+        items = self.canvas.find_withtag("current")
+        return self.circle_index.get(items[0]) if items else None
+
+    def zoom(self, factor, x, y):
+        if not MIN_CIRCLE_CELL / 2 <= self.cell * factor <= 4 * MAX_CELL:
+            return
+        self.scale(factor, x, y)
+        self.update_scrollregion()
+
+
+class BitmapView(GridView):
+    # One image for the whole torus, in which every vertex is a square of cell x cell pixels.
+    # Only the cells of vertices that change are painted, the highlight is a single rectangle.
+    def __init__(self, canvas, m, n, cell, max_path_steps=MAX_PATH_STEPS):
+        super().__init__(canvas, m, n, cell, n * cell, m * cell, max_path_steps)
+        self.max_cell = max(1, MAX_IMAGE_SIZE // max(m, n))
+        self.base = tk.PhotoImage(master=canvas, width=n, height=m)  # one pixel per vertex
+        self.base.put('#ffffff', to=(0, 0, n, m))
+        self.image = self.base.zoom(cell)
+        self.image_id = canvas.create_image(self.x0, self.y0, image=self.image, anchor='nw')
+        self.cursor = None  # rectangle around the highlighted vertex
+        self.fills = {}  # color of every filled vertex
+        self.dots = {}  # color of the dot of every familiar vertex
+        self.hex_colors = {'white': '#ffffff'}  # PhotoImage.put needs colors without spaces
+        self.update_scrollregion()
+
+    def hex_color(self, color):
+        if color not in self.hex_colors:
+            red, green, blue = self.canvas.winfo_rgb(color)
+            self.hex_colors[color] = f"#{red >> 8:02x}{green >> 8:02x}{blue >> 8:02x}"
+        return self.hex_colors[color]
+
+    def paint(self, index):
+        row, col = divmod(index, self.n)
+        fill = self.fills.get(index, '#ffffff')
+        dot = self.dots.get(index)
+        pixel = dot if dot is not None and index not in self.fills else fill
+        self.base.put(pixel, to=(col, row, col + 1, row + 1))
+
+        cell = int(self.cell)
+        x, y = col * cell, row * cell
+        if cell < 3:
+            self.image.put(pixel, to=(x, y, x + cell, y + cell))
+            return
+        self.image.put(fill, to=(x, y, x + cell, y + cell))
+        if dot is not None:
+            inset = cell // 3
+            self.image.put(dot, to=(x + inset, y + inset, x + cell - inset, y + cell - inset))
+
+    def highlight(self, index):
+        x, y = self.center(index)
+        half = max(self.offset, 2)
+        if self.cursor is None:
+            self.cursor = self.canvas.create_rectangle(0, 0, 0, 0, outline='red', width=2)
+        self.canvas.coords(self.cursor, x - half, y - half, x + half, y + half)
+
+    def unhighlight(self, index):
+        pass  # the cursor is moved by the next highlight
+
+    def fill(self, index, color):
+        if color == 'white':
+            self.fills.pop(index, None)
+        else:
+            self.fills[index] = self.hex_color(color)
+        self.paint(index)
+
+    def create_dot(self, index, color):
+        self.dots[index] = self.hex_color(color)
+        self.paint(index)
+        return index
+
+    def color_dot(self, index, color):
+        self.dots[index] = self.hex_color(color)
+        self.paint(index)
+
+    def delete_dot(self, index):
+        del self.dots[index]
+        self.paint(index)
+
+    def create_heatmap(self, usage):
+        return HeatImage(self, usage)
+
+    def index_at(self, event):
+        col = int((self.canvas.canvasx(event.x) - self.x0) // self.cell)
+        row = int((self.canvas.canvasy(event.y) - self.y0) // self.cell)
+        if 0 <= row < self.m and 0 <= col < self.n:
+            return row * self.n + col
+        return None
+
+    def zoom(self, factor, x, y):
+        cell = int(self.cell)
+        new_cell = max(1, min(round(cell * factor), self.max_cell))
+        if new_cell == cell and factor > 1:
+            new_cell = min(cell + 1, self.max_cell)
+        elif new_cell == cell and factor < 1:
+            new_cell = max(cell - 1, 1)
+        if new_cell == cell:
+            return
+        self.scale(new_cell / cell, x, y)
+        self.cell = new_cell
+        self.offset = new_cell / 2
+        self.image = self.base.zoom(new_cell)
+        self.canvas.itemconfigure(self.image_id, image=self.image)
+        self.canvas.coords(self.image_id, self.x0, self.y0)
+        for index in self.dots:  # the base image only has one pixel per vertex
+            self.paint(index)
+        if self.path.heatmap is not None:
+            self.path.heatmap.show()
+        self.update_scrollregion()
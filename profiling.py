@@ -0,0 +1,161 @@
+# Optional instrumentation of the hot paths: time per phase (e.g. moving the explorer, marking the
+# familiar vertices, drawing a step, asking the advice oracle), the number of steps, the frontier
+# size over time and the number of canvas items. Nothing is instrumented unless a Profiler is
+# attached, so without one the apps and batch runs take exactly the same code paths as before.
+#
+#   profiler = Profiler()
+#   profiler.attach_app(app)  # or run_exploration(..., profiler=profiler)
+#   ...
+#   profiler.write("metrics.json")  # or "-" for a summary on stderr
+import cProfile
+import json
+import pstats
+import sys
+import time
+from array import array
+
+
+class Profiler:
+    def __init__(self, interval=100):
+        self.phases = {}  # [calls, seconds] of every phase
+        self.interval = interval  # steps between two samples of the frontier size and canvas items
+        self.steps = 0  # steps taken while attached
+        self.max_frontier = 0
+        self.samples = array('I')  # step, frontier size, canvas items (0 without canvas) of every sample
+        self.started = time.perf_counter()
+
+    def wrap(self, obj, name, phase=None, after=None):
+        # Replaces the method obj.name by a timed version on obj only; after(result) runs after every
+        # call. A method that is already wrapped is not wrapped again.
+        function = getattr(obj, name)
+        if getattr(function, "profiled", False):
+            return
+        totals = self.phases.setdefault(phase or name, [0, 0.0])
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            result = function(*args, **kwargs)
+            totals[0] += 1
+            totals[1] += clock() - start
+            if after is not None:
+                after(result)
+            return result
+
+        timed.profiled = True
+        setattr(obj, name, timed)
+
+    def after_step(self, explorer, canvas=None):
+        # after() of Explorer.step, which returns None if the step was not allowed
+        def after(new_familiars):
+            if new_familiars is not None and explorer.start is not None:
+                self.record_step(explorer, canvas)
+        return after
+
+    def record_step(self, explorer, canvas=None):
+        # Counts a step and samples the state every interval steps. Counting canvas items is a
+        # Tk call that takes time linear in their number, so it is only done for the samples.
+        self.steps += 1
+        frontier = explorer.frontier_size()
+        if frontier > self.max_frontier:
+            self.max_frontier = frontier
+        if self.steps % self.interval == 0:
+            self.samples.extend((len(explorer.walk) - 1, frontier, len(canvas.find_all()) if canvas is not None else 0))
+
+    def attach_explorer(self, explorer, strategy=None, oracle=None, canvas=None):
+        # Instruments a batch run: the steps of the explorer, the decisions of the strategy and the advice
+        self.wrap(explorer, "step", "explore", after=self.after_step(explorer, canvas))
+        if strategy is not None:
+            self.wrap(strategy, "next_direction", "strategy")
+        if oracle is not None:
+            self.wrap(oracle, "advise", "advice")
+
+    def attach_app(self, app):
+        # Instruments trusted.py or untrusted.py. The app replaces its explorer and view when a grid
+        # is generated or a walk is opened, and then highlights a vertex, so their methods are
+        # wrapped whenever a vertex is highlighted. Tk keeps the methods it was bound to, so only
+        # methods that the app calls through self can be wrapped. The steps of a replayed walk
+        # are counted as well.
+        def attach_state(result=None):
+            if app.explorer is not None:
+                self.wrap(app.explorer, "step", "explore", after=self.after_step(app.explorer, app.canvas))
+            if app.view is not None:
+                self.wrap(app.view, "draw_step")
+
+        self.wrap(app, "move_highlighted_circle")
+        self.wrap(app, "mark_neighboring_circles")
+        self.wrap(app, "update_neighboring_dots")
+        self.wrap(app, "highlight_circle", after=attach_state)
+        self.wrap(app, "redraw")
+        attach_state()
+
+    def merge(self, other):
+        # Adds the counters of another profiler, e.g. of a run in another process
+        for phase, (calls, seconds) in other.phases.items():
+            totals = self.phases.setdefault(phase, [0, 0.0])
+            totals[0] += calls
+            totals[1] += seconds
+        self.samples.extend(other.samples)
+        self.steps += other.steps
+        self.max_frontier = max(self.max_frontier, other.max_frontier)
+
+    def to_json(self):
+        samples = self.samples
+        return {
+            "seconds": time.perf_counter() - self.started,
+            "steps": self.steps,
+            "max_frontier": self.max_frontier,
+            "phases": {phase: {"calls": calls, "seconds": seconds} for phase, (calls, seconds) in self.phases.items()},
+            "samples": {"step": list(samples[0::3]), "frontier": list(samples[1::3]),
+                        "canvas_items": list(samples[2::3])},
+        }
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        lines = [f"{self.steps} steps in {elapsed:.2f} s, largest frontier {self.max_frontier}"]
+        if self.samples and self.samples[-1]:
+            lines[0] += f", {self.samples[-1]} canvas items at the last sample"
+        lines.append(f"{'phase':28} {'calls':>10} {'total ms':>12} {'us/call':>10} {'share':>7}")
+        for phase, (calls, seconds) in sorted(self.phases.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{phase:28} {calls:10} {1000 * seconds:12.1f} {1e6 * seconds / max(calls, 1):10.1f}"
+                         f" {seconds / elapsed if elapsed else 0:7.1%}")
+        return "\n".join(lines)
+
+    def write(self, path):
+        # JSON file, or - for a summary on stderr
+        if path == "-":
+            print(self.summary(), file=sys.stderr)
+            return
+        with open(path, "w") as file:
+            json.dump(self.to_json(), file, indent=1)
+
+
+def run_profiled(function, path, *args, **kwargs):
+    # Runs function under cProfile and writes the statistics to path (for pstats or snakeviz),
+    # or prints the 30 functions with the largest cumulative time for path "-"
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(function, *args, **kwargs)
+    finally:
+        if path == "-":
+            pstats.Stats(profile, stream=sys.stderr).sort_stats("cumulative").print_stats(30)
+        else:
+            profile.dump_stats(path)
+
+
+def add_arguments(parser):
+    parser.add_argument("--profile", metavar="FILE", help="run under cProfile and write the statistics, - to print them")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="time the hot paths and write the metrics as JSON, - to print a summary")
+
+
+def run_main(args, run, profiler=None):
+    # Runs run() under cProfile if args.profile is set (see add_arguments) and writes the metrics
+    # of the attached profiler to args.metrics afterwards
+    try:
+        if args.profile:
+            return run_profiled(run, args.profile)
+        return run()
+    finally:
+        if profiler is not None:
+            profiler.write(args.metrics)
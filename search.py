@@ -0,0 +1,436 @@
+# Exact worst case of the best online explorer on small tori, as a game between the explorer and
+# an adversary that chooses the dimensions of the torus. The explorer knows that the torus is one
+# of the candidates (e.g. all m x n with 3 <= m, n <= 6) but not which. Vertices have unique labels,
+# so after every new vertex it learns which of the labels of its neighbors it has seen before,
+# and the adversary may answer with any candidate that is consistent with everything seen so far.
+#
+#   python search.py --m 3-5 --n 3-5 --workers 0
+#
+# Between two new vertices, the explorer learns nothing, so it walks on a shortest known route:
+# a move of the game is the choice of the next familiar vertex to visit, and the game ends once
+# every familiar vertex is visited and the explorer walked back to v_0. The search is a minimax
+# search with alpha-beta pruning over the knowledge of the explorer, with
+# - the known vertices numbered in the order they were seen and the visited ones as a bitmask,
+#   and for every candidate that is still consistent the vertex behind every number;
+# - a transposition table, keyed by the knowledge relabeled by the vertices of one candidate and
+#   reduced under the automorphisms of the torus that fix v_0 (reflections, and transposition if
+#   the candidates are closed under it), since all vertices of a torus are alike and v_0 can be 0;
+# - a lower bound per candidate (its unvisited vertices and the way back), which prunes most moves.
+import argparse
+import collections
+import fractions
+import itertools
+import multiprocessing
+import os
+import queue
+import sys
+
+from batch import parse_values
+from graphs import grid_graph
+
+INFINITY = float("inf")
+stop = None  # event that stops the search of a pool process, see start_worker
+
+
+class Stopped(Exception):
+    pass
+
+
+class Candidate:
+    # An m x n torus with v_0 = 0, its neighbor table and the vertex permutations of its automorphisms
+    def __init__(self, m, n):
+        graph = grid_graph("torus", m, n)
+        self.dims = (m, n)
+        self.size = m * n
+        self.neighbors = [tuple(graph.neighbors(index)) for index in range(self.size)]
+
+    def symmetry(self, flip_rows, flip_cols, transpose):
+        # Image of every vertex, and the dimensions of the torus it lies on
+        m, n = self.dims
+        image = []
+        for index in range(self.size):
+            row, col = divmod(index, n)
+            row = -row % m if flip_rows else row
+            col = -col % n if flip_cols else col
+            image.append(col * m + row if transpose else row * n + col)
+        return (n, m) if transpose else (m, n), image
+
+
+class Knowledge:
+    # What the explorer knows: the known vertices by number (v_0 is 0), the neighbor numbers of the
+    # visited ones, its position, and for every consistent candidate the vertex behind every number
+    __slots__ = ("candidates", "vertices", "adjacency", "visited", "position")
+
+    def __init__(self, candidates, vertices, adjacency, visited, position):
+        self.candidates = candidates  # Candidate objects that are still consistent
+        self.vertices = vertices  # tuple of vertex tuples, one per candidate
+        self.adjacency = adjacency  # neighbor numbers of every visited number, None for the others
+        self.visited = visited  # bitmask of the visited numbers
+        self.position = position
+
+    def known(self):
+        return len(self.adjacency)
+
+    def frontier(self):
+        return ((1 << self.known()) - 1) & ~self.visited
+
+    def distances(self):
+        # BFS over the visited vertices, the only ones whose edges are known
+        adjacency = self.adjacency
+        distance = {self.position: 0}
+        queue = collections.deque([self.position])
+        while queue:
+            number = queue.popleft()
+            neighbors = adjacency[number]
+            if neighbors is None:
+                continue
+            for neighbor in neighbors:
+                if neighbor not in distance:
+                    distance[neighbor] = distance[number] + 1
+                    queue.append(neighbor)
+        return distance
+
+
+def visit(knowledge, number):
+    # The explorer visits the familiar vertex number. Candidates that answer with the same
+    # neighbor numbers stay together; returns the knowledge for every possible answer.
+    known = knowledge.known()
+    answers = {}
+    for candidate, vertices in zip(knowledge.candidates, knowledge.vertices):
+        numbers = {vertex: index for index, vertex in enumerate(vertices)}
+        new = []
+        answer = []
+        for vertex in candidate.neighbors[vertices[number]]:
+            if vertex not in numbers:
+                numbers[vertex] = known + len(new)
+                new.append(vertex)
+            answer.append(numbers[vertex])
+        group = answers.setdefault(tuple(answer), ([], [], len(new)))
+        group[0].append(candidate)
+        group[1].append(vertices + tuple(new))
+    children = []
+    for answer, (candidates, vertices, new) in answers.items():
+        adjacency = knowledge.adjacency + (None,) * new
+        adjacency = adjacency[:number] + (answer,) + adjacency[number + 1:]
+        children.append(Knowledge(tuple(candidates), tuple(vertices), adjacency,
+                                  knowledge.visited | (1 << number), number))
+    return children
+
+
+def start(candidates):
+    # Possible knowledge after visiting v_0
+    vertices = tuple((0,) for _ in candidates)
+    return visit(Knowledge(tuple(candidates), vertices, (None,), 0, 0), 0)
+
+
+class Game:
+    # Value of the game for the explorer: the least worst case of q * tour length - p * mn over
+    # all explorers, so the explorer is p/q-competitive if and only if the value is at most 0,
+    # and p = 0, q = 1 gives the worst-case tour length itself.
+    def __init__(self, candidates, p, q, max_entries=4_000_000):
+        self.candidates = candidates
+        self.p = p
+        self.q = q
+        self.max_entries = max_entries
+        self.table = {}  # lower and upper bound of the value of every canonical knowledge
+        self.nodes = 0
+        self.stop = None  # multiprocessing.Event that aborts the search with Stopped once it is set
+        dims = {candidate.dims for candidate in candidates}
+        transposable = all((n, m) in dims for m, n in dims)
+        self.symmetries = [symmetry for symmetry in itertools.product((False, True), repeat=3)
+                           if transposable or not symmetry[2]]
+        self.images = {(candidate.dims, symmetry): candidate.symmetry(*symmetry)
+                       for candidate in candidates for symmetry in self.symmetries}
+
+    def key(self, knowledge):
+        # Smallest relabeling of the knowledge under the symmetries; the numbers are replaced by
+        # the vertices of the candidate with the smallest dimensions
+        best = None
+        images = self.images
+        for symmetry in self.symmetries:
+            mapped = sorted((images[candidate.dims, symmetry][0],
+                             tuple(images[candidate.dims, symmetry][1][vertex] for vertex in vertices))
+                            for candidate, vertices in zip(knowledge.candidates, knowledge.vertices))
+            reference = mapped[0][1]
+            order = sorted(range(len(reference)), key=reference.__getitem__)
+            visited = 0
+            for number in order:
+                if knowledge.visited >> number & 1:
+                    visited |= 1 << reference[number]
+            key = (tuple(dims for dims, _ in mapped), reference[knowledge.position], visited,
+                   tuple(tuple(vertices[number] for number in order) for _, vertices in mapped[1:]))
+            if best is None or key < best:
+                best = key
+        return best
+
+    def lower_bound(self, knowledge):
+        # Every candidate may still be the torus, and on it the explorer has to visit all unvisited
+        # vertices and then take at least one more step back to v_0
+        visited = bin(knowledge.visited).count("1")
+        return max(self.q * (candidate.size - visited + 1) - self.p * candidate.size
+                   for candidate in knowledge.candidates)
+
+    def moves(self, knowledge):
+        # (distance, number) of the familiar vertices, closest first
+        distance = knowledge.distances()
+        frontier = knowledge.frontier()
+        return sorted((distance[number], number) for number in range(knowledge.known()) if frontier >> number & 1)
+
+    def explorer(self, knowledge, alpha=-INFINITY, beta=INFINITY):
+        # Value of the knowledge with the explorer to move; fail-soft, so a value <= alpha is an
+        # upper bound and a value >= beta a lower bound of the exact value
+        self.nodes += 1
+        if self.stop is not None and self.nodes % 4096 == 0 and self.stop.is_set():
+            raise Stopped
+        if not knowledge.frontier():
+            size = knowledge.candidates[0].size  # every consistent candidate has all vertices visited
+            return self.q * knowledge.distances()[0] - self.p * size
+        bound = self.lower_bound(knowledge)
+        if bound >= beta:
+            return bound
+        key = self.key(knowledge)
+        lower, upper = self.table.get(key, (bound, INFINITY))
+        if lower >= beta:
+            return lower
+        if upper <= alpha:
+            return upper
+        low, high = max(alpha, lower), min(beta, upper)
+        best = INFINITY
+        for distance, number in self.moves(knowledge):
+            cost = self.q * distance
+            if cost + bound - self.q >= best:  # a step costs q, the bound counts one step already
+                break  # the moves are sorted by distance
+            value = cost + self.adversary(knowledge, number, low - cost, min(high, best) - cost)
+            if value < best:
+                best = value
+                if best <= low:
+                    break
+        if len(self.table) >= self.max_entries:
+            self.table.clear()
+        if best <= low:
+            upper = min(upper, best)
+        elif best >= high:
+            lower = max(lower, best)
+        else:
+            lower = upper = best
+        self.table[key] = (lower, upper)
+        return best
+
+    def adversary(self, knowledge, number, alpha=-INFINITY, beta=INFINITY):
+        # Value after visiting number, with the adversary choosing the answer
+        return self.answer(visit(knowledge, number), alpha, beta)
+
+    def answer(self, children, alpha=-INFINITY, beta=INFINITY):
+        best = -INFINITY
+        for child in sorted(children, key=self.lower_bound, reverse=True):
+            value = self.explorer(child, max(alpha, best), beta)
+            if value > best:
+                best = value
+                if best >= beta:
+                    break
+        return best
+
+
+class Split:
+    # An explorer node of the top of the game tree, which is searched in parallel: either it is
+    # expanded into its moves (cost, answers) or its value is searched by one task. Knowledge that
+    # is equal up to a symmetry appears once, however many paths lead to it.
+    __slots__ = ("knowledge", "moves", "offsets", "value", "window")
+
+    def __init__(self, knowledge):
+        self.knowledge = knowledge
+        self.moves = None  # [(cost, [Split of every answer])] once expanded
+        self.offsets = [INFINITY, -INFINITY]  # least and largest cost of the paths from the root
+        self.value = None  # result of the task, fail-soft with respect to window
+        self.window = None
+
+    def bounds(self, memo):
+        # Interval of the exact value that is known so far
+        if id(self) in memo:
+            return memo[id(self)]
+        if self.moves is None:
+            if self.value is None:
+                result = (-INFINITY, INFINITY)
+            elif self.value <= self.window[0]:
+                result = (-INFINITY, self.value)
+            elif self.value >= self.window[1]:
+                result = (self.value, INFINITY)
+            else:
+                result = (self.value, self.value)
+        else:
+            results = [(cost + max(child.bounds(memo)[0] for child in answers),
+                        cost + max(child.bounds(memo)[1] for child in answers)) for cost, answers in self.moves]
+            result = (min(low for low, _ in results), min(high for _, high in results))
+        memo[id(self)] = result
+        return result
+
+    def combine(self, memo):
+        # Fail-soft value from the values of the tasks, like Game.explorer would have returned
+        if id(self) not in memo:
+            if self.moves is None:
+                memo[id(self)] = self.value
+            else:
+                memo[id(self)] = min(cost + max(child.combine(memo) for child in answers) for cost, answers in self.moves)
+        return memo[id(self)]
+
+
+def split(game, children, tasks):
+    # Expands the top of the tree ply by ply until it has at least tasks distinct explorer nodes
+    # (or the games end), sharing the nodes with the same key; returns the root answers and the leaves
+    def node(knowledge, low, high):
+        key = game.key(knowledge)
+        if key not in level:
+            level[key] = Split(knowledge)
+        split_node = level[key]
+        split_node.offsets = [min(split_node.offsets[0], low), max(split_node.offsets[1], high)]
+        return split_node
+
+    level = {}
+    roots = [node(child, 0, 0) for child in children]
+    finished = []  # leaves in which the game is over
+    while True:
+        current = [split_node for split_node in level.values() if split_node.knowledge.frontier()]
+        finished.extend(split_node for split_node in level.values() if not split_node.knowledge.frontier())
+        if not current or len(current) + len(finished) >= tasks:
+            return roots, current + finished
+        level = {}
+        for split_node in current:
+            low, high = split_node.offsets
+            split_node.moves = []
+            for distance, number in game.moves(split_node.knowledge):
+                cost = game.q * distance
+                answers = [node(child, low + cost, high + cost) for child in visit(split_node.knowledge, number)]
+                split_node.moves.append((cost, answers))
+
+
+def start_worker(event):
+    # Initializer of the pool processes: the event is set once the pending tasks are not needed
+    global stop
+    stop = event
+
+
+def solve_task(dims, p, q, knowledge, alpha, beta):
+    # Value of an explorer node, for the process pool; None if the search was stopped
+    game = Game([Candidate(m, n) for m, n in dims], p, q)
+    game.stop = stop
+    try:
+        return game.explorer(knowledge, alpha, beta), game.nodes
+    except Stopped:
+        return None
+
+
+def game_value(dims, p, q, alpha=-INFINITY, beta=INFINITY, workers=1):
+    # Value of the game on the candidate tori dims, fail-soft with respect to (alpha, beta).
+    # With several workers, the top of the tree is expanded until there are a few distinct explorer
+    # nodes per worker, symmetric ones only once. Every node is searched by one task with the window
+    # shifted by the cost of the paths to it, and once the finished tasks decide the value with
+    # respect to the window, the running ones are stopped.
+    candidates = [Candidate(m, n) for m, n in dims]
+    game = Game(candidates, p, q)
+    children = start(candidates)
+    if workers <= 1:
+        return game.answer(children, alpha, beta), game.nodes
+
+    roots, leaves = split(game, children, 8 * workers)
+    nodes = game.nodes
+    # A task is only submitted when a worker is free, so its window starts at the best value found
+    # so far. The workers poll the event instead of being terminated, which can deadlock the pool.
+    results = queue.Queue()
+    pending = iter(leaves)
+    best = alpha
+    value = None
+    event = multiprocessing.Event()
+    with multiprocessing.Pool(workers, start_worker, (event,)) as pool:
+        def submit():
+            leaf = next(pending, None)
+            if leaf is not None:
+                leaf.window = (best - leaf.offsets[1], beta - leaf.offsets[0])
+                pool.apply_async(solve_task, (dims, p, q, leaf.knowledge, *leaf.window),
+                                 callback=lambda result: results.put((leaf, result)),
+                                 error_callback=lambda error: results.put((None, error)))
+
+        for _ in range(2 * workers):
+            submit()
+        for _ in leaves:
+            leaf, result = results.get()
+            if leaf is None:
+                raise result
+            leaf.value, count = result
+            nodes += count
+            memo = {}
+            low = max(root.bounds(memo)[0] for root in roots)
+            high = max(root.bounds(memo)[1] for root in roots)
+            if high <= alpha or low >= beta or low == high:
+                value = high if high <= alpha else low
+                break
+            best = max(best, low)
+            submit()
+        event.set()
+        pool.close()
+        pool.join()
+    if value is None:
+        memo = {}
+        value = max(root.combine(memo) for root in roots)
+    return value, nodes
+
+
+def competitive_ratio(dims, workers=1):
+    # Smallest p/q for which the explorer can guarantee a tour of at most p/q * mn, found by binary
+    # search over the ratios L / mn with mn <= L <= 2mn (depth-first search stays below 2mn).
+    # Every probe only decides whether the value is at most 0, a search with the window (0, 1).
+    sizes = {m * n for m, n in dims}
+    ratios = sorted({fractions.Fraction(length, size) for size in sizes for length in range(size, 2 * size + 1)})
+    low, high = 0, len(ratios) - 1
+    nodes = 0
+    while low < high:
+        middle = (low + high) // 2
+        ratio = ratios[middle]
+        value, count = game_value(dims, ratio.numerator, ratio.denominator, 0, 1, workers)
+        nodes += count
+        if value <= 0:
+            high = middle
+        else:
+            low = middle + 1
+    return ratios[low], nodes
+
+
+def worst_case_length(dims, workers=1):
+    # Least worst-case tour length, by binary search between the largest mn and 2mn: every probe
+    # decides whether the tour is at most length, a search with the window (length, length + 1)
+    low, high = max(m * n for m, n in dims), 2 * max(m * n for m, n in dims)
+    nodes = 0
+    while low < high:
+        middle = (low + high) // 2
+        value, count = game_value(dims, 0, 1, middle, middle + 1, workers)
+        nodes += count
+        if value <= middle:
+            high = middle
+        else:
+            low = middle + 1
+    return low, nodes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exact worst case of the best online explorer on small tori.")
+    parser.add_argument("--m", nargs="+", required=True, help="numbers of rows the adversary may choose, e.g. 3-6")
+    parser.add_argument("--n", nargs="+", required=True, help="numbers of columns the adversary may choose, e.g. 3-6")
+    parser.add_argument("--objective", nargs="+", default=["ratio", "length"], choices=["ratio", "length"],
+                        help="worst-case competitive ratio and/or tour length")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes, 0 for one per CPU")
+    args = parser.parse_args(argv)
+    dims = sorted(itertools.product(parse_values(args.m), parse_values(args.n)))
+    if any(m < 2 or n < 2 for m, n in dims):
+        parser.error("m and n must be at least 2")
+    workers = args.workers or os.cpu_count()
+
+    if "ratio" in args.objective:
+        ratio, nodes = competitive_ratio(dims, workers)
+        print(f"competitive ratio: {ratio} = {float(ratio):.4f} ({nodes} nodes)")
+    if "length" in args.objective:
+        length, nodes = worst_case_length(dims, workers)
+        print(f"worst-case tour length: {length} ({nodes} nodes)")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
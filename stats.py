@@ -0,0 +1,182 @@
+# Streaming statistics of many explorations: every run is added once and then dropped, so memory
+# only depends on the number of groups (e.g. one per m, n, strategy and error rate) and not on
+# the number of runs.
+#
+#   summary = Summary(["graph", "m", "n", "strategy", "advice", "error_rate"])
+#   for row in batch.sweep(...):
+#       summary.add(row)
+#   summary.to_json()
+import math
+
+METRICS = ["tour_length", "revisits", "competitive_ratio", "max_frontier"]
+GROUP_BY = ["graph", "m", "n", "strategy", "advice", "error_rate"]
+
+
+class RunningStats:
+    # Count, mean, variance (Welford's algorithm), minimum and maximum of a stream of numbers
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared differences from the mean
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        # Adds the values of other (Chan et al.), e.g. of a sweep that ran elsewhere
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def variance(self):
+        # Sample variance, 0 for fewer than 2 values
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def std(self):
+        return math.sqrt(self.variance())
+
+
+class QuantileSketch:
+    # Counts of values in logarithmic buckets (as in DDSketch): every quantile is returned with a
+    # relative error of at most relative_accuracy, and there are only about
+    # log(max / min) / relative_accuracy / 2 buckets, no matter how many values were added.
+    # Values must not be negative; zeros are counted separately.
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}  # bucket i holds the values in (gamma^(i-1), gamma^i]
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value, count=1):
+        if value < 0:
+            raise ValueError("QuantileSketch only takes values >= 0")
+        self.count += count
+        if value == 0:
+            self.zeros += count
+            return
+        bucket = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("sketches with different accuracies cannot be merged")
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def value(self, bucket):
+        # Representative of a bucket, within relative_accuracy of every value in it
+        return 2 * self.gamma ** bucket / (self.gamma + 1)
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if rank < seen:
+                return self.value(bucket)
+        return self.value(max(self.buckets))
+
+    def histogram(self, low, high, bins=20):
+        # [low, high, count] of bins of equal width between low and high (the smallest and largest
+        # value); the values of a bucket go to the bin of its representative value
+        if not self.count:
+            return []
+        if high <= low:
+            return [[low, high, self.count]]
+        width = (high - low) / bins
+        counts = [0] * bins
+        counts[0] += self.zeros
+        for bucket, count in self.buckets.items():
+            counts[max(0, min(int((self.value(bucket) - low) / width), bins - 1))] += count
+        return [[low + i * width, low + (i + 1) * width, count] for i, count in enumerate(counts)]
+
+
+class MetricStats:
+    def __init__(self, relative_accuracy=0.01):
+        self.running = RunningStats()
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, value):
+        self.running.add(value)
+        self.sketch.add(value)
+
+    def merge(self, other):
+        self.running.merge(other.running)
+        self.sketch.merge(other.sketch)
+
+    def to_dict(self, quantiles=(0.5, 0.9, 0.99), bins=20):
+        running = self.running
+        if not running.count:
+            return {"mean": None, "std": None, "min": None, "max": None, "quantiles": {}, "histogram": []}
+        return {
+            "mean": running.mean,
+            "std": running.std(),
+            "min": running.min,
+            "max": running.max,
+            # the exact minimum and maximum are known, so no quantile needs to lie outside of them
+            "quantiles": {f"p{round(100 * q, 1):g}": min(max(self.sketch.quantile(q), running.min), running.max)
+                          for q in quantiles},
+            "histogram": self.sketch.histogram(running.min, running.max, bins),
+        }
+
+
+class Summary:
+    # MetricStats of every metric per group of runs; a group is given by the values of group_by in a row
+    def __init__(self, group_by=GROUP_BY, metrics=METRICS, relative_accuracy=0.01):
+        self.group_by = list(group_by)
+        self.metrics = list(metrics)
+        self.relative_accuracy = relative_accuracy
+        self.groups = {}  # key -> [number of runs, {metric: MetricStats}]
+
+    def group(self, key):
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = [0, {metric: MetricStats(self.relative_accuracy) for metric in self.metrics}]
+        return group
+
+    def add(self, row):
+        group = self.group(tuple(row[field] for field in self.group_by))
+        group[0] += 1
+        for metric, stats in group[1].items():
+            stats.add(row[metric])
+
+    def merge(self, other):
+        for key, (runs, metrics) in other.groups.items():
+            group = self.group(key)
+            group[0] += runs
+            for metric, stats in metrics.items():
+                group[1][metric].merge(stats)
+
+    def to_json(self, quantiles=(0.5, 0.9, 0.99), bins=20):
+        result = []
+        for key in sorted(self.groups):
+            runs, metrics = self.groups[key]
+            group = dict(zip(self.group_by, key))
+            group["runs"] = runs
+            for metric, stats in metrics.items():
+                group[metric] = stats.to_dict(quantiles, bins)
+            result.append(group)
+        return result
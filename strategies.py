@@ -0,0 +1,193 @@
+# Automated explorers for a TorusExplorer (or an Explorer of another graph from graphs.py).
+# Like a human in trusted.py/untrusted.py, a strategy only knows the visited vertices,
+# their neighbors (the familiar vertices) and, if it takes advice, the advised next vertex
+# from an oracle in advice.py.
+from collections import deque
+
+from advice import TrustedAdvice
+from explorer import DOWN, LEFT, RIGHT
+from graphs import GRID_KINDS
+
+
+def shortest_route(explorer, is_target):
+    # BFS over the known part of the torus: edges are only known at visited vertices.
+    # Returns the directions of a shortest path to a vertex with is_target(vertex), or None.
+    # The search stops at the first target, so it only expands the vertices closer than it.
+    position = explorer.position
+    visits = explorer.visits
+    neighbor = explorer.neighbor
+    ports = range(explorer.ports)
+    parent = {position: None}  # (previous vertex, direction) of every reached vertex
+    queue = deque([position])
+    while queue:
+        index = queue.popleft()
+        if index != position and is_target(index):
+            route = []
+            while parent[index] is not None:
+                index, direction = parent[index]
+                route.append(direction)
+            route.reverse()
+            return route
+        if not visits[index]:
+            continue
+        for direction in ports:
+            neighbor_index = neighbor(index, direction)
+            if neighbor_index >= 0 and neighbor_index not in parent:
+                parent[neighbor_index] = (index, direction)
+                queue.append(neighbor_index)
+    return None
+
+
+def optimal_tour_length(m, n):
+    # Offline, the whole torus is known and a Hamiltonian cycle (see advice.py) is an optimal tour
+    return m * n if m * n > 1 else 0
+
+
+class Strategy:
+    name = None
+    uses_advice = False  # whether the strategy needs an advice oracle
+    torus_only = False  # whether the strategy needs the Hamiltonian cycles of a torus
+    # symmetries of the torus that do not change the results of the strategy, see cache.py
+    symmetries = ("translation",)
+
+    def __init__(self, explorer, rng, advice=None):
+        self.explorer = explorer
+        self.rng = rng
+        self.advice = advice
+        self.route = deque()  # remaining directions to the closest unvisited vertex (or v_0)
+        self.route_position = None  # position the route continues from
+
+    def next_direction(self):
+        # Direction of the next step, or None once the exploration is complete
+        raise NotImplementedError
+
+    def nearest_unvisited(self):
+        # First direction of a shortest path to an unvisited vertex, or to v_0 once all are visited.
+        # The route only leads over visited vertices, so the known part of the torus does not
+        # change while it is followed and it stays a shortest route: the BFS only runs again
+        # once the route is finished or the strategy left it.
+        explorer = self.explorer
+        if not self.route or self.route_position != explorer.position:
+            if explorer.visited_count < explorer.size:
+                route = shortest_route(explorer, lambda index: not explorer.visits[index])
+            elif explorer.position != explorer.start:
+                route = shortest_route(explorer, lambda index: index == explorer.start)
+            else:
+                route = None
+            if not route:
+                return None
+            self.route = deque(route)
+        direction = self.route.popleft()
+        self.route_position = explorer.neighbor(explorer.position, direction)
+        return direction
+
+    def unvisited_neighbor(self):
+        # First direction that leads to an unvisited vertex, or None
+        explorer = self.explorer
+        for direction in range(explorer.ports):
+            neighbor_index = explorer.neighbor(explorer.position, direction)
+            if neighbor_index >= 0 and not explorer.visits[neighbor_index]:
+                return direction
+        return None
+
+    def direction_to(self, index):
+        # Direction from the position to the neighbor index, or None
+        explorer = self.explorer
+        for direction in range(explorer.ports):
+            if explorer.neighbor(explorer.position, direction) == index:
+                return direction
+        return None
+
+
+class NearestFrontier(Strategy):
+    # Greedy: visit an unvisited neighbor if there is one, otherwise the closest familiar vertex
+    name = "nearest"
+
+    def next_direction(self):
+        direction = self.unvisited_neighbor()
+        return direction if direction is not None else self.nearest_unvisited()
+
+
+class DepthFirst(Strategy):
+    # Depth-first search: visit an unvisited neighbor if there is one, otherwise go back along
+    # the search tree. Every step takes O(1) and the tour is shorter than 2mn.
+    name = "dfs"
+
+    def __init__(self, explorer, rng, advice=None):
+        super().__init__(explorer, rng, advice)
+        self.path = [explorer.position]  # vertices of the search tree from v_0 to the position
+
+    def next_direction(self):
+        explorer = self.explorer
+        if explorer.visited_count < explorer.size:
+            direction = self.unvisited_neighbor()
+            if direction is not None:
+                self.path.append(explorer.neighbor(explorer.position, direction))
+                return direction
+            if len(self.path) > 1:
+                self.path.pop()
+                return self.direction_to(self.path[-1])
+        return self.nearest_unvisited()
+
+
+class Snake(Strategy):
+    # Boustrophedon sweep: each row is traversed completely, alternately to the right and to the left,
+    # then the explorer moves down to the next row. On a torus, it visits every vertex exactly once
+    # and then returns to v_0, which is a Hamiltonian cycle if m is even (n is irrelevant).
+    # Once the sweep hits the border of a grid, it continues like NearestFrontier.
+    name = "snake"
+
+    def __init__(self, explorer, rng, advice=None):
+        super().__init__(explorer, rng, advice)
+        self.sweeping = explorer.graph.kind in GRID_KINDS  # only tori, cylinders and grids have rows
+
+    def next_direction(self):
+        explorer = self.explorer
+        count = explorer.visited_count
+        if self.sweeping and count < explorer.size:
+            if count % explorer.n:
+                direction = RIGHT if (count // explorer.n) % 2 == 0 else LEFT
+            else:
+                direction = DOWN
+            neighbor_index = explorer.neighbor(explorer.position, direction)
+            if neighbor_index >= 0 and not explorer.visits[neighbor_index]:
+                return direction
+            self.sweeping = False
+        direction = self.unvisited_neighbor()
+        return direction if direction is not None else self.nearest_unvisited()
+
+
+class FollowAdvice(Strategy):
+    # Follows the advice as long as it leads to unvisited vertices, otherwise acts like NearestFrontier
+    name = "advice"
+    uses_advice = True
+    torus_only = True
+
+    def next_direction(self):
+        explorer = self.explorer
+        advised = self.advice.advise()
+        if not explorer.visits[advised]:
+            return self.direction_to(advised)
+        return self.nearest_unvisited()
+
+
+class OfflineOptimal(Strategy):
+    # Baseline that knows the whole torus in advance: follows a Hamiltonian cycle through v_0,
+    # so its tour length is optimal_tour_length(m, n)
+    name = "optimal"
+    torus_only = True
+
+    def __init__(self, explorer, rng, advice=None):
+        super().__init__(explorer, rng, advice)
+        if explorer.graph.kind != "torus":
+            raise ValueError("the optimal tour is only known for tori")
+        self.cycle = TrustedAdvice(explorer, rng)
+
+    def next_direction(self):
+        explorer = self.explorer
+        if explorer.is_complete() or explorer.size == 1:
+            return None
+        return self.direction_to(self.cycle.advise())
+
+
+STRATEGIES = {strategy.name: strategy for strategy in (NearestFrontier, DepthFirst, Snake, FollowAdvice, OfflineOptimal)}
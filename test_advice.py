@@ -0,0 +1,24 @@
+# Checks the Hamiltonian cycles of advice.py, on which the trusted advice and the optimal strategy rely.
+#
+#   python -m pytest test_advice.py
+from advice import hamiltonian_cycle
+
+
+def test_hamiltonian_cycle():
+    for m in range(1, 15):
+        for n in range(1, 15):
+            successor = hamiltonian_cycle(m, n)
+            assert len(successor) == m * n
+            index, length = 0, 0
+            while True:
+                row, col = divmod(index, n)
+                next_row, next_col = divmod(successor[index], n)
+                # a step to a neighbor on the torus, a loop on a torus with one vertex
+                steps = ((next_row - row) % m, (next_col - col) % n)
+                assert m * n == 1 or steps in ((1 % m, 0), ((-1) % m, 0), (0, 1 % n), (0, (-1) % n)), (m, n, index)
+                index = successor[index]
+                length += 1
+                if index == 0:
+                    break
+                assert length < m * n, (m, n)
+            assert length == m * n, (m, n)
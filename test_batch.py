@@ -0,0 +1,39 @@
+# Checks that cached sweeps give the same rows as plain ones and run one instance per cache key.
+#
+#   python -m pytest test_batch.py
+import argparse
+
+import batch
+from cache import ResultCache, instance_key
+
+
+def sweep_instances(m, n, strategies):
+    args = argparse.Namespace(graph=["torus", "cylinder", "grid"], m=m, n=n, starts="all", strategy=strategies,
+                              advice=["trusted"], error_rate=[0.0], seed=0)
+    return list(batch.instances(args))
+
+
+def test_cached_sweep(tmp_path, monkeypatch):
+    instances = sweep_instances(range(3, 7), range(3, 7), ["nearest", "dfs", "snake", "optimal"])
+    keys = {instance_key(instance) for instance in instances}
+    assert len(keys) < len(instances) // 2
+
+    runs = []
+    run_exploration = batch.run_exploration
+
+    def counted(*instance, **kwargs):
+        runs.append(instance)
+        return run_exploration(*instance, **kwargs)
+
+    expected = list(batch.sweep(instances))
+    monkeypatch.setattr(batch, "run_exploration", counted)
+    for chunk_size in (1, 64):  # windows of 16 and 1024 instances
+        cache = ResultCache(str(tmp_path / f"cache{chunk_size}.db"))
+        runs.clear()
+        assert list(batch.cached_sweep(instances, cache, chunk_size=chunk_size)) == expected
+        assert len(runs) == cache.misses == len(keys)
+        assert cache.hits == len(instances) - len(keys)
+        runs.clear()
+        assert list(batch.cached_sweep(instances, cache, chunk_size=chunk_size)) == expected
+        assert not runs
+        cache.close()
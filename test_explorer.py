@@ -0,0 +1,72 @@
+# Checks the engine of explorer.py: after random steps, undos, redos, snapshots and restores, the
+# state equals that of an explorer that took the same moves from v_0.
+#
+#   python -m pytest test_explorer.py
+import random
+from array import array
+
+import pytest
+
+from explorer import TorusExplorer
+from graphs import GRID_KINDS
+
+
+def rebuilt(explorer):
+    # A new explorer that took the moves of explorer
+    other = TorusExplorer(explorer.m, explorer.n, explorer.trusted, explorer.graph.kind)
+    if explorer.start is None:
+        other.place(explorer.position)
+        return other
+    other.place(explorer.start)
+    other.begin()
+    for direction in explorer.moves:
+        assert other.step(direction) is not None
+    return other
+
+
+def state(explorer):
+    return (explorer.start, explorer.position, list(explorer.walk), bytes(explorer.moves), list(explorer.visits),
+            list(explorer.familiar), explorer.visited_count, explorer.familiar_count)
+
+
+@pytest.mark.parametrize("kind", list(GRID_KINDS))
+@pytest.mark.parametrize("trusted", [False, True])
+def test_undo_redo(kind, trusted):
+    rng = random.Random(f"{kind} {trusted}")
+    for _ in range(20):
+        m, n = rng.randint(1, 6), rng.randint(1, 6)
+        explorer = TorusExplorer(m, n, trusted, kind)
+        explorer.place(rng.randrange(m * n))
+        explorer.begin()
+        snapshot = None
+        for _ in range(300):
+            operation = rng.random()
+            if operation < 0.5:
+                position = explorer.position
+                direction = rng.randrange(explorer.ports)
+                target = explorer.neighbor(position, direction)
+                visited = target >= 0 and explorer.visits[target] > 0
+                complete = explorer.visited_count == explorer.size
+                result = explorer.step(direction)
+                if target < 0:
+                    assert result is None and explorer.position == position
+                elif explorer.start is None:
+                    assert result == [] and explorer.position == target
+                elif trusted and visited:
+                    # trusted mode only allows the revisit that returns to v_0 once every vertex is visited
+                    assert (result is not None) == (target == explorer.start and complete)
+                else:
+                    assert result is not None and explorer.position == target
+            elif operation < 0.7:
+                explorer.undo()
+            elif operation < 0.85:
+                explorer.redo()
+            elif operation < 0.95:
+                if explorer.start is not None:
+                    snapshot = explorer.snapshot(), array('I', explorer.walk), bytearray(explorer.moves)
+            elif snapshot is not None:
+                explorer.restore(*snapshot)
+                snapshot = snapshot[0], array('I', snapshot[1]), bytearray(snapshot[2])
+            assert state(explorer) == state(rebuilt(explorer))
+            assert explorer.visited_count == sum(1 for visits in explorer.visits if visits)
+            assert explorer.familiar_count == sum(1 for number in explorer.familiar if number)
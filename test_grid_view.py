@@ -0,0 +1,205 @@
+# Checks the path layer of grid_view.py on a stub canvas, which needs no display: drawing a walk
+# step by step, with undone steps, gives the same items as drawing it at once.
+#
+#   python -m pytest test_grid_view.py
+import random
+
+import pytest
+
+import grid_view
+from explorer import TorusExplorer
+
+
+class Canvas:
+    # The canvas methods used by the views, keeping the items in a dict
+    def __init__(self):
+        self.items = {}
+        self.next_id = 1
+
+    def winfo_width(self):
+        return 1900
+
+    def winfo_height(self):
+        return 1000
+
+    def canvasx(self, x):
+        return x
+
+    def canvasy(self, y):
+        return y
+
+    def bind(self, *args):
+        pass
+
+    def bbox(self, *args):
+        return 0, 0, 1, 1
+
+    def configure(self, **options):
+        pass
+
+    def scale(self, *args):
+        pass
+
+    def tag_raise(self, *args):
+        pass
+
+    def winfo_rgb(self, color):
+        return 0, 0, 0
+
+    def create(self, kind, coords, options):
+        self.items[self.next_id] = [kind, list(coords), options]
+        self.next_id += 1
+        return self.next_id - 1
+
+    def create_oval(self, *coords, **options):
+        return self.create('oval', coords, options)
+
+    def create_line(self, *coords, **options):
+        return self.create('line', coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self.create('rectangle', coords, options)
+
+    def create_image(self, *coords, **options):
+        return self.create('image', coords, options)
+
+    def coords(self, item, *coords):
+        self.items[item][1] = list(coords)
+
+    def itemconfigure(self, item, **options):
+        self.items[item][2].update(options)
+
+    def delete(self, item):
+        del self.items[item]
+
+    def lines(self):
+        return sorted((coords, options.get('fill')) for kind, coords, options in self.items.values() if kind == 'line')
+
+
+class PhotoImage:
+    # The pixels of a tkinter.PhotoImage in a dict, transparent ones are missing. No image may be
+    # larger than the largest bitmap, which HeatImage.show must not exceed when zooming.
+    def __init__(self, master=None, width=0, height=0):
+        assert width * height <= grid_view.MAX_IMAGE_SIZE ** 2
+        self.width = width
+        self.height = height
+        self.pixels = {}
+
+    def put(self, color, to):
+        x0, y0, x1, y1 = to
+        assert 0 <= x0 < x1 <= self.width and 0 <= y0 < y1 <= self.height
+        self.pixels.update({(x, y): color for x in range(x0, x1) for y in range(y0, y1)})
+
+    def blank(self):
+        self.pixels.clear()
+
+    def zoom(self, factor):
+        return PhotoImage(None, self.width * factor, self.height * factor)  # the vertex bitmap is not checked
+
+
+class Tk:
+    # The copies of photo images that HeatImage makes: a zoomed or subsampled part of an image, or
+    # a transparent pixel repeated over a rectangle
+    def call(self, image, command, source, *args):
+        assert command == 'copy'
+        options = {}
+        for arg in args:
+            if isinstance(arg, str) and arg.startswith('-'):
+                values = options[arg] = []
+            else:
+                values.append(arg)
+        x0, y0, x1, y1 = options.get('-from', [0, 0, source.width, source.height])
+        zoom = options.get('-zoom', [1])[0]
+        subsample = options.get('-subsample', [1])[0]
+        to = options.get('-to', [0, 0])
+        if len(to) == 4:  # source is repeated over the rectangle
+            assert source.width == source.height == 1 and not source.pixels
+            for x in range(to[0], to[2]):
+                for y in range(to[1], to[3]):
+                    image.pixels.pop((x, y), None)
+            return
+        # Tk subsamples before zooming: every subsample-th pixel is repeated zoom times
+        for (x, y), color in source.pixels.items():
+            if x0 <= x < x1 and y0 <= y < y1 and (x - x0) % subsample == 0 and (y - y0) % subsample == 0:
+                left, top = to[0] + (x - x0) // subsample * zoom, to[1] + (y - y0) // subsample * zoom
+                for dx in range(zoom):
+                    for dy in range(zoom):
+                        if left + dx < image.width and top + dy < image.height:
+                            image.pixels[left + dx, top + dy] = color
+
+
+def random_walk(view, m, n, rng, steps):
+    # Takes and undoes random steps on a TorusExplorer and draws them on the view
+    explorer = TorusExplorer(m, n)
+    explorer.begin()
+    for _ in range(steps):
+        if len(explorer.walk) > 1 and rng.random() < 0.3:
+            index, previous, _ = explorer.undo()
+            view.undo_step(previous, index)
+        else:
+            position = explorer.position
+            explorer.step(rng.randrange(4))
+            view.draw_step(position, explorer.position)
+    return explorer.walk
+
+
+@pytest.mark.parametrize("max_steps", [5, 50, 10 ** 6])
+def test_circle_view_path(max_steps):
+    rng = random.Random(max_steps)
+    for _ in range(30):
+        m, n = rng.randint(1, 7), rng.randint(1, 7)
+        canvas = Canvas()
+        view = grid_view.CircleView(canvas, m, n, 40, max_steps)
+        walk = random_walk(view, m, n, rng, rng.randint(0, 200))
+        drawn = Canvas()
+        grid_view.CircleView(drawn, m, n, 40, max_steps).draw_walk(walk)
+        assert view.path.steps == len(walk) - 1
+        if view.path.heatmap is None or len(walk) - 1 > max_steps:  # the heatmap stays when steps are undone
+            assert canvas.lines() == drawn.lines()
+
+
+def shown_pixels(heatmap, cell):
+    # The pixels of the heat image: every pixel of the source zoomed by cell / pixels, like
+    # source.zoom(cell).subsample(pixels)
+    pixels, shown = heatmap.pixels, {}
+    for (x, y), color in heatmap.source.pixels.items():
+        for image_x in range(-(-x * cell // pixels), -(-(x + 1) * cell // pixels)):
+            for image_y in range(-(-y * cell // pixels), -(-(y + 1) * cell // pixels)):
+                shown[image_x, image_y] = color
+    return shown
+
+
+def test_bitmap_view_heatmap(monkeypatch):
+    monkeypatch.setattr(grid_view.tk, "PhotoImage", PhotoImage)
+    monkeypatch.setattr(Canvas, "tk", Tk(), raising=False)
+    rng = random.Random(1)
+    for _ in range(30):
+        m, n = rng.randint(1, 6), rng.randint(1, 6)
+        canvas = Canvas()
+        view = grid_view.BitmapView(canvas, m, n, rng.choice([1, 2, 3, 5]), 10)
+        items = len(canvas.items)
+        walk = random_walk(view, m, n, rng, rng.randint(20, 200))
+        if view.path.heatmap is None:
+            continue
+        assert len(canvas.items) <= items + 1  # the heat image
+        drawn = grid_view.BitmapView(Canvas(), m, n, view.cell, 10)
+        drawn.draw_walk(walk)
+        heatmap, expected = view.path.heatmap, drawn.path.heatmap
+        assert heatmap.edges.pixels == expected.edges.pixels
+        assert heatmap.vertices.pixels == expected.vertices.pixels
+        assert heatmap.image.pixels == shown_pixels(heatmap, view.cell)
+        view.zoom(2, 0, 0)
+        assert heatmap.image.pixels == shown_pixels(heatmap, view.cell)
+
+
+def test_bitmap_view_heatmap_zoom(monkeypatch):
+    # Zooming a large torus to the largest cells keeps every image within the size bound of PhotoImage
+    monkeypatch.setattr(grid_view.tk, "PhotoImage", PhotoImage)
+    monkeypatch.setattr(Canvas, "tk", Tk(), raising=False)
+    view = grid_view.BitmapView(Canvas(), 100, 100, 10, 10)
+    random_walk(view, 100, 100, random.Random(2), 100)
+    heatmap = view.path.heatmap
+    while view.cell < view.max_cell:
+        view.zoom(1.25, 0, 0)
+        assert heatmap.image.pixels == shown_pixels(heatmap, view.cell)
+    assert view.cell == 40
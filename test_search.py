@@ -0,0 +1,64 @@
+# Compares search.py with a plain memoised minimax without pruning, bounds or symmetries.
+#
+#   python -m pytest test_search.py
+import fractions
+import functools
+
+import pytest
+
+from search import Candidate, INFINITY, competitive_ratio, game_value, start, visit
+
+DIMS = [((3, 3), (3, 4)), ((2, 3), (2, 4), (3, 3)), ((2, 2), (2, 3), (2, 4)), ((3, 4),)]
+RATIOS = [(0, 1), (1, 1), (5, 4), (4, 3), (3, 2)]
+
+
+@functools.lru_cache(maxsize=None)
+def minimax(dims, p, q):
+    memo = {}
+
+    def explorer(knowledge):
+        key = (tuple(candidate.dims for candidate in knowledge.candidates), knowledge.vertices, knowledge.visited,
+               knowledge.position)
+        if key not in memo:
+            distances = knowledge.distances()
+            frontier = knowledge.frontier()
+            if not frontier:
+                memo[key] = q * distances[0] - p * knowledge.candidates[0].size
+            else:
+                memo[key] = min(q * distances[number] + max(explorer(child) for child in visit(knowledge, number))
+                                for number in range(knowledge.known()) if frontier >> number & 1)
+        return memo[key]
+
+    return max(explorer(child) for child in start([Candidate(m, n) for m, n in dims]))
+
+
+@pytest.mark.parametrize("dims", DIMS)
+@pytest.mark.parametrize("p, q", RATIOS)
+def test_game_value(dims, p, q):
+    expected = minimax(dims, p, q)
+    assert game_value(dims, p, q)[0] == expected
+    value, _ = game_value(dims, p, q, 0, 1)
+    assert (value <= 0) == (expected <= 0)
+
+
+@pytest.mark.parametrize("dims", DIMS[:2])
+@pytest.mark.parametrize("window", [(-INFINITY, INFINITY), (0, 1), (-3, 2)])
+def test_parallel_game_value(dims, window):
+    alpha, beta = window
+    for p, q in RATIOS:
+        expected = minimax(dims, p, q)
+        value, _ = game_value(dims, p, q, alpha, beta, workers=2)
+        if alpha < expected < beta:
+            assert value == expected
+        else:
+            assert (value <= alpha) == (expected <= alpha) and (value >= beta) == (expected >= beta)
+
+
+def test_competitive_ratio():
+    # The ratio is guaranteed, and no smaller ratio L / mn is
+    for dims in DIMS:
+        ratio, _ = competitive_ratio(dims)
+        assert minimax(dims, ratio.numerator, ratio.denominator) <= 0
+        smaller = [fractions.Fraction(length, m * n) for m, n in dims for length in range(m * n, 2 * m * n + 1)]
+        smaller = max((other for other in smaller if other < ratio), default=None)
+        assert smaller is None or minimax(dims, smaller.numerator, smaller.denominator) > 0
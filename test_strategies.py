@@ -0,0 +1,24 @@
+# Checks the strategies of strategies.py on graphs without rows.
+#
+#   python -m pytest test_strategies.py
+import random
+
+from explorer import Explorer
+from graphs import Graph
+from strategies import STRATEGIES
+
+
+def test_snake_on_csr_graph():
+    # A graph whose vertices have 4 ports is not a grid: the snake does not sweep it as rows
+    size = 12
+    edges = [(index, (index + 1) % size) for index in range(size)] + [(index, (index + 5) % size) for index in range(size)]
+    explorer = Explorer(Graph.from_edges(size, edges))
+    assert explorer.ports == 4
+    explorer.begin()
+    strategy = STRATEGIES["snake"](explorer, random.Random(0))
+    assert not strategy.sweeping
+    direction = strategy.next_direction()
+    while direction is not None:
+        assert explorer.step(direction) is not None
+        direction = strategy.next_direction()
+    assert explorer.is_complete()
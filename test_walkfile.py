@@ -0,0 +1,89 @@
+# Checks the walk file format and jumps of WalkReplay.
+#
+#   python -m pytest test_walkfile.py
+import random
+
+import pytest
+
+import walkfile
+from explorer import TorusExplorer
+
+
+def random_explorer(m, n, trusted, kind, rng, steps):
+    # An explorer that has taken up to steps random allowed steps from a random v_0
+    explorer = TorusExplorer(m, n, trusted, kind)
+    explorer.place(rng.randrange(m * n))
+    explorer.begin()
+    for _ in range(steps):
+        allowed = [direction for direction in range(4) if explorer.step(direction) is not None]
+        if not allowed:
+            break
+        explorer.undo()
+        explorer.step(rng.choice(allowed))
+    return explorer
+
+
+def state(explorer):
+    return (explorer.position, list(explorer.walk), bytes(explorer.moves), list(explorer.visits),
+            list(explorer.familiar), explorer.visited_count, explorer.familiar_count)
+
+
+@pytest.mark.parametrize("kind", walkfile.KINDS)
+@pytest.mark.parametrize("trusted", [False, True])
+def test_round_trip(tmp_path, kind, trusted):
+    rng = random.Random(kind)
+    for steps in (0, 1, 3, 4, 5, 101):
+        explorer = random_explorer(rng.randint(1, 9), rng.randint(2, 9), trusted, kind, rng, steps)
+        path = tmp_path / "walk.walk"
+        walkfile.save_walk(path, walkfile.Walk.from_explorer(explorer))
+        walk = walkfile.load_walk(path)
+        assert (walk.m, walk.n, walk.start, walk.trusted, walk.kind) == \
+               (explorer.m, explorer.n, explorer.start, trusted, kind)
+        assert walk.directions == explorer.moves
+        replay = walkfile.WalkReplay(walk)
+        assert state(replay.seek(len(replay))) == state(explorer)
+
+
+def test_version_1(tmp_path):
+    directions = bytearray([0, 1, 2, 3, 3, 2])
+    path = tmp_path / "walk.walk"
+    path.write_bytes(walkfile.HEADER_V1.pack(walkfile.MAGIC, 1, True, 5, 7, 12, len(directions))
+                     + walkfile.pack_directions(directions))
+    walk = walkfile.load_walk(path)
+    assert (walk.m, walk.n, walk.start, walk.trusted, walk.kind) == (5, 7, 12, True, "torus")
+    assert walk.directions == directions
+
+
+def test_invalid_files(tmp_path):
+    path = tmp_path / "walk.walk"
+    walkfile.save_walk(path, walkfile.Walk(4, 5, 3, bytearray([1, 3, 0, 2, 1])))
+    data = path.read_bytes()
+    for invalid in (data[:-1], data + b"\0", data[:10], b"NOPE" + data[4:]):
+        path.write_bytes(invalid)
+        with pytest.raises(ValueError):
+            walkfile.load_walk(path)
+    for start in (20, 2**32 - 1):
+        walkfile.save_walk(path, walkfile.Walk(4, 5, start, bytearray([1])))
+        with pytest.raises(ValueError, match="v_0"):
+            walkfile.load_walk(path)
+
+
+@pytest.mark.parametrize("interval", [1, 2, 7, 50])
+def test_seek(interval):
+    rng = random.Random(interval)
+    for kind in walkfile.KINDS:
+        explorer = random_explorer(rng.randint(2, 8), rng.randint(2, 8), False, kind, rng, 300)
+        walk = walkfile.Walk.from_explorer(explorer)
+        replay = walkfile.WalkReplay(walk, interval)
+        for _ in range(40):
+            step = rng.randint(-5, len(walk.directions) + 5)
+            fresh = walkfile.WalkReplay(walk, interval).seek(step)
+            assert state(replay.seek(step)) == state(fresh)
+            assert replay.current() == max(0, min(step, len(walk.directions)))
+
+
+def test_step_not_allowed():
+    # A walk that revisits a vertex in trusted mode ends before that step
+    walk = walkfile.Walk(3, 3, 0, bytearray([3, 2, 3]), trusted=True)
+    replay = walkfile.WalkReplay(walk)
+    assert replay.seek(3).position == 1 and len(replay) == 1 and "step 2" in replay.error
@@ -0,0 +1,101 @@
+# NumPy versions of the exploration state for whole tori and for many explorers at once.
+# Requires numpy (pip install numpy); the rest of the project does not need it.
+import functools
+
+import numpy as np
+
+from explorer import DIRECTIONS
+
+
+@functools.lru_cache(maxsize=16)
+def neighbor_table(m, n):
+    # (m*n, 4) table of the wrapped neighbors of every vertex, in the order up, down, left, right
+    rows, cols = np.divmod(np.arange(m * n, dtype=np.int32), n)
+    table = np.empty((m * n, 4), dtype=np.int32)
+    for direction, (dx, dy) in enumerate(DIRECTIONS):
+        table[:, direction] = (rows + dy) % m * n + (cols + dx) % n
+    table.flags.writeable = False
+    return table
+
+
+def explorer_arrays(explorer):
+    # Views of the visit counts and familiar arrays (nonzero for familiar vertices) of a TorusExplorer,
+    # without copying them
+    visits = np.frombuffer(explorer.visits, dtype=np.uint16 if explorer.visits.typecode == 'H' else np.uint32)
+    familiar = np.frombuffer(explorer.familiar, dtype=np.uint32)
+    return visits, familiar
+
+
+# The following work on the state of one explorer (1-d arrays) as well as on a (k, m*n) state matrix
+
+def unexplored_count(visits):
+    return np.count_nonzero(visits == 0, axis=-1)
+
+
+def frontier(visits, familiar):
+    # Familiar vertices that have not been visited yet
+    return (familiar != 0) & (visits == 0)
+
+
+def frontier_size(visits, familiar):
+    return np.count_nonzero(frontier(visits, familiar), axis=-1)
+
+
+class ExplorerBatch:
+    # k explorers on the same m x n torus, each row of the state matrices is one explorer.
+    # The semantics are those of TorusExplorer after begin().
+    def __init__(self, m, n, starts, trusted=False):
+        self.m = m
+        self.n = n
+        self.size = m * n
+        self.trusted = trusted
+        self.table = neighbor_table(m, n)
+        self.starts = np.asarray(starts, dtype=np.int32)
+        self.k = len(self.starts)
+        self.rows = np.arange(self.k)
+        self.positions = self.starts.copy()
+        self.visits = np.zeros((self.k, self.size), dtype=np.uint16)
+        self.familiar = np.zeros((self.k, self.size), dtype=np.bool_)
+        self.steps = np.zeros(self.k, dtype=np.int64)  # tour length of every explorer
+        self.newly_familiar = self.visit(np.ones(self.k, dtype=np.bool_))
+
+    def visit(self, active):
+        # Visits the current positions of the active explorers, returns a (k, 4) mask of the
+        # neighbors (self.table[self.positions]) that became familiar
+        rows = self.rows[active]
+        positions = self.positions[active]
+        self.visits[rows, positions] += 1
+
+        neighbors = self.table[positions]
+        new = (self.visits[rows[:, None], neighbors] == 0) & ~self.familiar[rows[:, None], neighbors]
+        for direction in range(1, 4):  # on small tori, a vertex can be a neighbor in several directions
+            new[:, direction] &= ~(neighbors[:, :direction] == neighbors[:, direction, None]).any(axis=1)
+        explorers, directions = np.nonzero(new)
+        self.familiar[rows[explorers], neighbors[explorers, directions]] = True
+
+        newly_familiar = np.zeros((self.k, 4), dtype=np.bool_)
+        newly_familiar[active] = new
+        return newly_familiar
+
+    def step(self, directions):
+        # Moves every explorer in its direction, -1 keeps it in place.
+        # Returns the mask of explorers that moved; in trusted mode, moves into visited vertices are refused.
+        directions = np.asarray(directions)
+        active = directions >= 0
+        targets = self.table[self.positions, np.where(active, directions, 0)]
+        if self.trusted:
+            complete = (unexplored_count(self.visits) == 0) & (targets == self.starts)
+            active &= (self.visits[self.rows, targets] == 0) | complete
+        self.positions = np.where(active, targets, self.positions)
+        self.steps += active
+        self.newly_familiar = self.visit(active)
+        return active
+
+    def unexplored_count(self):
+        return unexplored_count(self.visits)
+
+    def frontier_size(self):
+        return frontier_size(self.visits, self.familiar)
+
+    def is_complete(self):
+        return (self.unexplored_count() == 0) & (self.positions == self.starts)
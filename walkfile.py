@@ -0,0 +1,149 @@
+# Binary file format for walks, and replaying a walk with jumps to any step.
+#
+# A walk file is a header (magic, version, mode, graph, m, n, v_0, number of steps), followed by
+# the direction of every step with 2 bits per step, 4 steps per byte, first step in the low bits.
+# Version 1 files have no graph in the header and are walks on tori.
+import struct
+from array import array
+
+from explorer import TorusExplorer
+from graphs import GRID_KINDS
+
+MAGIC = b"TORW"
+VERSION = 2
+HEADER = struct.Struct("<4sBBBIIIQ")  # magic, version, trusted, graph, m, n, v_0, number of steps
+HEADER_V1 = struct.Struct("<4sBBIIIQ")  # magic, version, trusted, m, n, v_0, number of steps
+KINDS = list(GRID_KINDS)  # graph numbers in the header
+
+UNPACK = [bytes((byte & 3, byte >> 2 & 3, byte >> 4 & 3, byte >> 6)) for byte in range(256)]
+
+
+def pack_directions(directions):
+    directions = bytes(directions)
+    padded = directions + bytes(-len(directions) % 4)
+    return bytes(a | b << 2 | c << 4 | d << 6
+                 for a, b, c, d in zip(padded[0::4], padded[1::4], padded[2::4], padded[3::4]))
+
+
+def unpack_directions(data, count):
+    return bytearray(b"".join([UNPACK[byte] for byte in data])[:count])
+
+
+class Walk:
+    def __init__(self, m, n, start, directions, trusted=False, kind="torus"):
+        self.m = m
+        self.n = n
+        self.start = start  # index of v_0
+        self.directions = directions  # bytearray with the direction of every step
+        self.trusted = trusted
+        self.kind = kind  # torus, cylinder or grid
+
+    @classmethod
+    def from_explorer(cls, explorer):
+        if explorer.graph.kind not in GRID_KINDS:
+            raise ValueError("only walks on tori, cylinders and grids can be saved")
+        return cls(explorer.m, explorer.n, explorer.start, bytearray(explorer.moves), explorer.trusted,
+                   explorer.graph.kind)
+
+    def explorer(self):
+        # A TorusExplorer that has chosen v_0, but not taken any step yet
+        explorer = TorusExplorer(self.m, self.n, self.trusted, self.kind)
+        if not explorer.place(self.start):
+            raise ValueError(f"v_0 = {self.start} is not a vertex of the {self.m} x {self.n} {self.kind}")
+        explorer.begin()
+        return explorer
+
+
+def save_walk(path, walk):
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, walk.trusted, KINDS.index(walk.kind), walk.m, walk.n, walk.start,
+                               len(walk.directions)))
+        file.write(pack_directions(walk.directions))
+
+
+def load_walk(path):
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < HEADER_V1.size or data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a walk file")
+    version = data[4]
+    if version == 1:
+        magic, version, trusted, m, n, start, count = HEADER_V1.unpack_from(data)
+        kind, body = 0, data[HEADER_V1.size:]
+    elif version == VERSION and len(data) >= HEADER.size:
+        magic, version, trusted, kind, m, n, start, count = HEADER.unpack_from(data)
+        body = data[HEADER.size:]
+    else:
+        raise ValueError(f"{path} has unsupported version {version}")
+    if kind >= len(KINDS):
+        raise ValueError(f"{path} has an unknown graph {kind}")
+    if not 0 <= start < m * n:
+        raise ValueError(f"{path} has v_0 = {start} outside of the {m} x {n} graph")
+    if len(body) != (count + 3) // 4:
+        raise ValueError(f"{path} is truncated")
+    return Walk(m, n, start, unpack_directions(body, count), bool(trusted), KINDS[kind])
+
+
+class WalkReplay:
+    # Replays a walk and jumps to any step. Every interval steps, a snapshot of the per-vertex
+    # state is kept, so a jump restores the closest earlier snapshot and replays at most
+    # interval steps. The interval is at least the number of vertices, so the snapshots take at
+    # most a few bytes per step. The snapshots are taken by a second explorer, the scout, that
+    # replays the walk once: build() lets it take a number of steps at a time, e.g. while a GUI
+    # is idle, and a jump beyond the steps it has taken builds up to there first, which takes as
+    # long as replaying these steps. Creating a replay takes no steps at all.
+    def __init__(self, walk, interval=None):
+        self.walk = walk
+        self.explorer = walk.explorer()
+        self.scout = walk.explorer()
+        self.interval = interval or max(1024, walk.m * walk.n)
+        self.snapshots = {0: self.scout.snapshot()}
+        self.positions = self.scout.walk  # every vertex of the walk that the scout has reached
+        self.error = None  # why the walk was cut short, if one of its steps is not allowed
+
+    def __len__(self):
+        return len(self.walk.directions)
+
+    def current(self):
+        return len(self.explorer.walk) - 1
+
+    def built(self):
+        # Number of steps for which the snapshots have been taken
+        return len(self.positions) - 1
+
+    def build(self, steps):
+        # Lets the scout take up to steps more steps; returns whether it has not reached the end yet.
+        # A step that is not allowed ends the walk before it and sets error.
+        scout = self.scout
+        directions = self.walk.directions
+        for number in range(self.built(), min(self.built() + steps, len(self))):
+            if scout.step(directions[number]) is None:
+                self.error = f"step {number + 1} of the walk is not allowed"
+                del directions[number:]
+                break
+            if (number + 1) % self.interval == 0:
+                self.snapshots[number + 1] = scout.snapshot()
+        return self.built() < len(self)
+
+    def seek(self, step):
+        # Moves the explorer to the state after the given number of steps
+        if step > self.built():
+            self.build(step - self.built())
+        step = max(0, min(step, len(self)))
+        current = self.current()
+        snapshot_step = step // self.interval * self.interval
+        if step < current or snapshot_step > current:
+            if step < current and current - step <= step - snapshot_step:
+                while self.current() > step:
+                    self.explorer.undo()
+                return self.explorer
+            self.explorer.restore(self.snapshots[snapshot_step], self.positions[:snapshot_step + 1],
+                                  self.walk.directions[:snapshot_step])
+        self.forward(step)
+        return self.explorer
+
+    def forward(self, step):
+        explorer = self.explorer
+        directions = self.walk.directions
+        for current in range(self.current(), step):
+            explorer.step(directions[current])  # the scout has taken this step already